@@ -0,0 +1,205 @@
+# SPDX-License-Identifier: Apache-2.0
+
+import functools
+import hashlib
+import importlib.metadata
+import json
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Any, Final
+
+from loguru import logger
+
+import mckrl
+
+# Bump whenever the layout of cache entries changes
+CACHE_FORMAT_VERSION: Final[int] = 1
+CACHE_METADATA_FILE_NAME: Final[str] = "entry.json"
+DEFAULT_CACHE_MAX_MB: Final[int] = 1024
+
+# Generated output also depends on the footprint library that serialises it
+UPSTREAM_DISTRIBUTIONS: Final[list[str]] = ["kicad-footprint-generator"]
+
+
+@functools.cache
+def source_fingerprint(generator_file: Path) -> str:
+    """
+    Hashes every Python source the generator could depend on: the generator's
+    own package (models included) and mckrl's top level modules.
+    """
+    source_paths = sorted(generator_file.parent.rglob("*.py")) + sorted(
+        Path(mckrl.__file__).parent.glob("*.py")
+    )
+
+    digest = hashlib.sha256()
+    for source_path in source_paths:
+        digest.update(source_path.name.encode())
+        digest.update(source_path.read_bytes())
+
+    for distribution in UPSTREAM_DISTRIBUTIONS:
+        try:
+            digest.update(importlib.metadata.version(distribution).encode())
+        except importlib.metadata.PackageNotFoundError:
+            pass
+
+    return digest.hexdigest()
+
+
+def artifact_key(definition_key: str, generator_file: Path) -> str:
+    digest = hashlib.sha256()
+    digest.update(str(CACHE_FORMAT_VERSION).encode())
+    digest.update(definition_key.encode())
+    digest.update(source_fingerprint(generator_file).encode())
+    return digest.hexdigest()
+
+
+class CacheMetadataError(ValueError):
+    pass
+
+
+def _metadata_files(metadata: Any) -> list[tuple[str, str]]:
+    files = metadata.get("files") if isinstance(metadata, dict) else None
+    if not isinstance(files, list) or not all(
+        isinstance(file, list)
+        and len(file) == 2
+        and all(isinstance(part, str) for part in file)
+        for file in files
+    ):
+        raise CacheMetadataError("Cache entry metadata has no valid file list")
+    return [(root, relative_path) for root, relative_path in files]
+
+
+def _link_or_copy(source: Path, destination: Path):
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    destination.unlink(missing_ok=True)
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
+
+
+class ArtifactCache:
+    """
+    A content-addressed store of generated files that can be shared between
+    machines through a plain directory (local or NFS).
+
+    Entries are built in a private temporary directory & published with a single
+    rename, so concurrent writers of the same key never expose a partial entry.
+    Restoring an entry refreshes its modification time, which is what the LRU
+    garbage collector orders entries by.
+
+    The cache is only ever an optimisation, unreadable entries & failed writes
+    are logged & treated as a miss or a skipped publish rather than raised.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.entries_directory = directory / "entries"
+        self.temporary_directory = directory / "tmp"
+        self.entries_directory.mkdir(parents=True, exist_ok=True)
+        self.temporary_directory.mkdir(parents=True, exist_ok=True)
+
+    def entry_path(self, key: str) -> Path:
+        return self.entries_directory / key[:2] / key
+
+    def restore(self, key: str, roots: dict[str, Path]) -> list[Path] | None:
+        try:
+            return self.__restore(key, roots)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unusable cache entry {key}: {e}")
+            return None
+
+    def __restore(self, key: str, roots: dict[str, Path]) -> list[Path] | None:
+        entry = self.entry_path(key)
+        metadata_path = entry / CACHE_METADATA_FILE_NAME
+        try:
+            metadata = json.loads(metadata_path.read_text())
+        except FileNotFoundError:
+            return None
+        files = _metadata_files(metadata)
+
+        if any(root not in roots for root, _ in files):
+            return None
+
+        paths = []
+        for index, (root, relative_path) in enumerate(files):
+            destination = roots[root] / relative_path
+            try:
+                _link_or_copy(entry / str(index), destination)
+            except FileNotFoundError:
+                # Evicted by a concurrent garbage collection
+                return None
+            paths.append(destination)
+
+        os.utime(metadata_path)
+        return paths
+
+    def publish(self, key: str, roots: dict[str, Path], paths: list[Path]):
+        try:
+            self.__publish(key, roots, paths)
+        except OSError as e:
+            logger.warning(f"Skipped publishing cache entry {key}: {e}")
+
+    def __publish(self, key: str, roots: dict[str, Path], paths: list[Path]):
+        files = []
+        for path in paths:
+            for root, root_directory in roots.items():
+                if path.is_relative_to(root_directory):
+                    files.append((root, path.relative_to(root_directory).as_posix()))
+                    break
+            else:
+                # Outputs outside the known roots cannot be placed on restore
+                return
+
+        entry = self.entry_path(key)
+        if entry.exists():
+            return
+
+        staging = self.temporary_directory / f"{key}.{uuid.uuid4().hex}"
+        staging.mkdir()
+        try:
+            for index, path in enumerate(paths):
+                shutil.copyfile(path, staging / str(index))
+            (staging / CACHE_METADATA_FILE_NAME).write_text(
+                json.dumps({"files": files})
+            )
+
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.rename(staging, entry)
+            except OSError:
+                # Another writer published the same key first, theirs is identical
+                pass
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def collect_garbage(self) -> int:
+        """
+        Evicts least recently used entries until the cache fits in max_bytes,
+        returns the number of entries removed.
+        """
+        entries = []
+        total_bytes = 0
+        for metadata_path in self.entries_directory.glob(
+            f"*/*/{CACHE_METADATA_FILE_NAME}"
+        ):
+            entry = metadata_path.parent
+            try:
+                size = sum(path.stat().st_size for path in entry.iterdir())
+                entries.append((metadata_path.stat().st_mtime, size, entry))
+            except FileNotFoundError:
+                continue
+            total_bytes += size
+
+        removed = 0
+        for _, size, entry in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total_bytes -= size
+            removed += 1
+
+        return removed
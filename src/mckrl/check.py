@@ -0,0 +1,180 @@
+# SPDX-License-Identifier: Apache-2.0
+
+from typing import Final, NamedTuple
+
+import numpy as np
+
+from mckrl.kicad_mod import FootprintGeometry
+
+MIN_ANNULAR_RING_MM: Final[float] = 0.15
+MIN_HOLE_TO_HOLE_MM: Final[float] = 0.25
+MIN_COPPER_TO_HOLE_MM: Final[float] = 0.2
+SPACING_BOX_LAYER: Final[str] = "Dwgs.User"
+
+# Floating point noise from rotated pads should never be reported as a violation
+TOLERANCE_MM: Final[float] = 1e-6
+
+
+class Violation(NamedTuple):
+    footprint: str
+    rule: str
+    message: str
+
+
+class LibraryArrays(NamedTuple):
+    """
+    Pads of every footprint in a library packed into (footprint, pad) shaped
+    arrays, footprints with fewer pads than the largest one are padded with NaN
+    so every rule can be evaluated across the whole library at once.
+    """
+
+    names: list[str]
+    labels: list[list[str]]
+    centres: np.ndarray  # (F, P, 2)
+    copper_radius: np.ndarray  # (F, P), NaN for missing pads & NPTHs
+    hole_radius: np.ndarray  # (F, P), NaN for missing pads & SMD pads
+    plated: np.ndarray  # (F, P)
+    npth: np.ndarray  # (F, P)
+    box_min: np.ndarray  # (F, 2), NaN when there is no spacing box
+    box_max: np.ndarray  # (F, 2)
+
+
+def build_library_arrays(footprints: list[FootprintGeometry]) -> LibraryArrays:
+    footprint_count = len(footprints)
+    pad_count = max((len(footprint.pads) for footprint in footprints), default=0)
+
+    centres = np.full((footprint_count, pad_count, 2), np.nan)
+    copper_radius = np.full((footprint_count, pad_count), np.nan)
+    hole_radius = np.full((footprint_count, pad_count), np.nan)
+    plated = np.zeros((footprint_count, pad_count), dtype=bool)
+    npth = np.zeros((footprint_count, pad_count), dtype=bool)
+    box_min = np.full((footprint_count, 2), np.nan)
+    box_max = np.full((footprint_count, 2), np.nan)
+
+    for f, footprint in enumerate(footprints):
+        for p, pad in enumerate(footprint.pads):
+            centres[f, p] = (pad.x, pad.y)
+            # Pads are treated as circles circumscribing their copper, this is
+            # exact for the round pads we generate and conservative otherwise
+            if not pad.is_npth:
+                copper_radius[f, p] = max(pad.width, pad.height) / 2
+            if pad.drill is not None:
+                hole_radius[f, p] = pad.drill / 2
+            plated[f, p] = pad.is_plated
+            npth[f, p] = pad.is_npth
+
+        box_points = [
+            point
+            for line in footprint.lines_on_layer(SPACING_BOX_LAYER)
+            for point in (line.start, line.end)
+        ]
+        if len(box_points) > 0:
+            box_min[f] = np.min(box_points, axis=0)
+            box_max[f] = np.max(box_points, axis=0)
+
+    return LibraryArrays(
+        names=[footprint.name for footprint in footprints],
+        labels=[[pad.label for pad in footprint.pads] for footprint in footprints],
+        centres=centres,
+        copper_radius=copper_radius,
+        hole_radius=hole_radius,
+        plated=plated,
+        npth=npth,
+        box_min=box_min,
+        box_max=box_max,
+    )
+
+
+def check_annular_ring(arrays: LibraryArrays) -> list[Violation]:
+    ring = arrays.copper_radius - arrays.hole_radius
+    failing = arrays.plated & (ring < MIN_ANNULAR_RING_MM - TOLERANCE_MM)
+
+    return [
+        Violation(
+            arrays.names[f],
+            "annular-ring",
+            f"{arrays.labels[f][p]} has a {ring[f, p]:.3f}mm annular ring "
+            f"(minimum {MIN_ANNULAR_RING_MM}mm)",
+        )
+        for f, p in zip(*np.nonzero(failing))
+    ]
+
+
+def _pairwise_gap(
+    arrays: LibraryArrays, radius_a: np.ndarray, radius_b: np.ndarray
+) -> np.ndarray:
+    offsets = arrays.centres[:, :, None, :] - arrays.centres[:, None, :, :]
+    distances = np.hypot(offsets[..., 0], offsets[..., 1])
+    return distances - radius_a[:, :, None] - radius_b[:, None, :]
+
+
+def check_hole_to_hole(arrays: LibraryArrays) -> list[Violation]:
+    gap = _pairwise_gap(arrays, arrays.hole_radius, arrays.hole_radius)
+    pad_count = arrays.centres.shape[1]
+    upper = np.triu(np.ones((pad_count, pad_count), dtype=bool), k=1)
+    failing = upper & (gap < MIN_HOLE_TO_HOLE_MM - TOLERANCE_MM)
+
+    return [
+        Violation(
+            arrays.names[f],
+            "hole-to-hole",
+            f"{arrays.labels[f][a]} and {arrays.labels[f][b]} drills are "
+            f"{gap[f, a, b]:.3f}mm apart (minimum {MIN_HOLE_TO_HOLE_MM}mm)",
+        )
+        for f, a, b in zip(*np.nonzero(failing))
+    ]
+
+
+def check_copper_to_hole(arrays: LibraryArrays) -> list[Violation]:
+    gap = _pairwise_gap(arrays, arrays.copper_radius, arrays.hole_radius)
+    pairs = ~arrays.npth[:, :, None] & arrays.npth[:, None, :]
+    failing = pairs & (gap < MIN_COPPER_TO_HOLE_MM - TOLERANCE_MM)
+
+    return [
+        Violation(
+            arrays.names[f],
+            "copper-to-hole",
+            f"{arrays.labels[f][a]} copper is {gap[f, a, b]:.3f}mm from "
+            f"{arrays.labels[f][b]} (minimum {MIN_COPPER_TO_HOLE_MM}mm)",
+        )
+        for f, a, b in zip(*np.nonzero(failing))
+    ]
+
+
+def check_spacing_box_containment(arrays: LibraryArrays) -> list[Violation]:
+    # Only copper has to stay inside the spacing box, NPTHs for stabiliser
+    # housings reach past it into the neighbouring key's space by design
+    extent = arrays.copper_radius[:, :, None]
+    lower = arrays.centres - extent < arrays.box_min[:, None, :] - TOLERANCE_MM
+    upper = arrays.centres + extent > arrays.box_max[:, None, :] + TOLERANCE_MM
+    failing = np.any(lower | upper, axis=2)
+
+    return [
+        Violation(
+            arrays.names[f],
+            "spacing-box",
+            f"{arrays.labels[f][p]} copper extends outside the "
+            f"{SPACING_BOX_LAYER} spacing box",
+        )
+        for f, p in zip(*np.nonzero(failing))
+    ]
+
+
+RULES: Final = [
+    check_annular_ring,
+    check_hole_to_hole,
+    check_copper_to_hole,
+    check_spacing_box_containment,
+]
+
+
+def check_footprints(footprints: list[FootprintGeometry]) -> list[Violation]:
+    if len(footprints) == 0:
+        return []
+
+    arrays = build_library_arrays(footprints)
+    violations = []
+    for rule in RULES:
+        violations += rule(arrays)
+
+    return sorted(violations)
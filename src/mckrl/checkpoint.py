@@ -0,0 +1,60 @@
+# SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Final
+
+# Dot-prefixed so it is left out of the release archive
+CHECKPOINT_FILE_NAME: Final[str] = ".mckrl-checkpoint.jsonl"
+
+
+def definition_key(definition: dict) -> str:
+    # The output directory is absolute & would tie the key to the working directory
+    stable_definition = {
+        key: value for key, value in definition.items() if key != "output_dir"
+    }
+    encoded = json.dumps(stable_definition, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class CheckpointJournal:
+    """
+    Append-only record of every definition that has been generated successfully.
+
+    Each completed definition is written as a single JSON line and flushed
+    immediately, so after a crash the journal holds everything that finished
+    and at worst one truncated line, which is ignored on resume.
+    """
+
+    def __init__(self, path: Path, resume: bool = False):
+        self.path = path
+        self.completed: set[tuple[str, str]] = set()
+
+        if resume and path.exists():
+            for line in path.read_text().splitlines():
+                try:
+                    entry = json.loads(line)
+                    self.completed.add((entry["file"], entry["definition"]))
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    continue
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.__file = open(path, "a" if resume else "w")
+
+    def is_complete(self, file: str, key: str) -> bool:
+        return (file, key) in self.completed
+
+    def record(self, file: str, key: str):
+        self.__file.write(json.dumps({"file": file, "definition": key}) + "\n")
+        self.__file.flush()
+        self.completed.add((file, key))
+
+    def close(self):
+        self.__file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
@@ -1,59 +1,85 @@
 # SPDX-License-Identifier: Apache-2.0
 
+import collections
+import contextlib
 import importlib.util
+import inspect
+import platform
+import statistics
+import threading
+import time
 import subprocess
+import tempfile
 from loguru import logger
 from rich.logging import RichHandler
+import rich.console
 import rich.progress
 import typer
-import yaml
 import os
 from jsonschema import validate
 
+from concurrent.futures import Executor, Future
 from pathlib import Path
-from yaml.loader import SafeLoader
-from typing import Annotated, Any, Final
-
+from typing import Annotated, Any, Final, NamedTuple
+
+from mckrl.cache import DEFAULT_CACHE_MAX_MB, ArtifactCache, artifact_key
+from mckrl.check import check_footprints
+from mckrl.combinations import (
+    FULL_SAMPLE,
+    Sample,
+    get_combinations_with_rules,
+    parse_sample,
+    sample_definitions,
+)
+from mckrl.definitions import Combinations, DefinitionLoader, is_fragment_file
+from mckrl.diff import diff_libraries, format_release_notes
+from mckrl.executors import (
+    ExecutorKind,
+    SerialExecutor,
+    create_executor,
+    is_gil_enabled,
+)
+from mckrl.events import (
+    EventStream,
+    JsonlEventWriter,
+    ProgressRenderer,
+    writes_to_stdout,
+)
+from mckrl.checkpoint import CHECKPOINT_FILE_NAME, CheckpointJournal, definition_key
+from mckrl.kicad_mod import find_footprint_files, read_footprint
+from mckrl.manifest import write_manifest
 from mckrl.model import create_validation_model
+from mckrl.preview import render_library_previews
+from mckrl.rules import CombinationRules
+from mckrl.targets import (
+    DEFAULT_TARGETS,
+    LIBRARY_TARGETS,
+    create_target,
+    parse_target_names,
+)
+
+
+def configure_logging(console: rich.console.Console | None = None):
+    logger.configure(
+        handlers=[{"sink": RichHandler(console=console), "format": "{message}"}]
+    )
+
+
+configure_logging()
 
-logger.configure(handlers=[{"sink": RichHandler(), "format": "{message}"}])
+_loaded_modules: dict[tuple[str, Path], Any] = {}
+_loaded_modules_lock = threading.Lock()
 
 VALID_YAML_SUFFIXES: Final[list[str]] = [".yaml", ".yml"]
+DEFAULT_EMIT_DIRECTORY: Final[Path] = Path("exports")
+# Upper bound on definitions submitted to an executor but not yet recorded
+MAX_PENDING_DEFINITIONS: Final[int] = 64
 
 
 def is_yaml_file(file: Path):
     return file.suffix.lower() in VALID_YAML_SUFFIXES
 
 
-# TODO: The terms combination & combination set can be confusing and as such should be renamed
-#       The "combinations" block in our yaml files, contain multiple "combination sets" which
-#       are evaluated independently for all possible combinations and then combined
-def get_combinations_for_combination_set(
-    combination_set: dict[str, list],
-) -> list[dict[str, Any]]:
-    if len(combination_set) == 0:
-        return []
-    all_combinations = [{}]
-    for key, values in combination_set.items():
-        combinations = []
-        for value in values:
-
-            def combination_creator(combination):
-                return {**combination, key: value}
-
-            combinations.extend(map(combination_creator, all_combinations))
-        all_combinations = combinations
-    return all_combinations
-
-
-def get_combinations(combinations: list[dict[str, list]]) -> list[dict[str, Any]]:
-    all_combinations = []
-    for combination_set in combinations:
-        all_combinations += get_combinations_for_combination_set(combination_set)
-
-    return all_combinations
-
-
 def get_path_in_relative_directory(relative_dir, path) -> Path:
     real_dir = os.path.realpath(relative_dir)
     path = real_dir + "/" + path
@@ -61,6 +87,21 @@ def get_path_in_relative_directory(relative_dir, path) -> Path:
 
 
 def load_python_module_from_file(module_name: str, path: Path):
+    """
+    Executes each generator module once per process, definition files sharing a
+    generator (& threads generating from it) all get the same module object.
+    """
+    key = (module_name, Path(path).resolve())
+    with _loaded_modules_lock:
+        module = _loaded_modules.get(key)
+        if module is None:
+            module = _execute_python_module_from_file(module_name, path)
+            _loaded_modules[key] = module
+
+    return module
+
+
+def _execute_python_module_from_file(module_name: str, path: Path):
     module_spec = importlib.util.spec_from_file_location(module_name, path)
     if module_spec is None:
         raise RuntimeError(
@@ -76,25 +117,38 @@ def load_python_module_from_file(module_name: str, path: Path):
     return module
 
 
-def compute_all_definitions(definition_dict: dict, base_dict: dict = {}) -> list[dict]:
+def compute_all_definitions(
+    definition_dict: dict,
+    base_dict: dict | None = None,
+    definition_combinations: Combinations | None = None,
+) -> list[dict]:
+    if base_dict is None:
+        base_dict = {}
     definition_default = definition_dict.get("defaults", {})
-    definition_combinations = get_combinations(definition_dict.get("combinations", []))
+    if definition_combinations is None:
+        definition_combinations = get_combinations_with_rules(
+            definition_dict.get("combinations", [])
+        )
     definition_inputs = definition_dict["inputs"]
 
     # Create a dummy empty combination to keep our loop simple
     if len(definition_combinations) == 0:
-        definition_combinations = [{}]
+        definition_combinations = [({}, CombinationRules())]
 
     definitions = []
 
     for definition_input in definition_inputs:
-        for definition_combination in definition_combinations:
-            definitions.append(
+        for definition_combination, rules in definition_combinations:
+            definition = (
                 base_dict
                 | definition_default
                 | definition_combination
                 | definition_input
             )
+            # Rules referencing defaults or inputs can only be decided here
+            if rules and not rules.allows(definition):
+                continue
+            definitions.append(definition)
 
     return definitions
 
@@ -111,8 +165,9 @@ def copy_constants(constants_directory: Path, output_directory: Path):
 cli = typer.Typer(add_completion=False)
 
 
-@cli.command()
+@cli.callback(invoke_without_command=True)
 def main(
+    ctx: typer.Context,
     definitions_directory: Annotated[Path, typer.Option("--definitions", "-d")] = Path(
         "definitions"
     ),
@@ -125,57 +180,496 @@ def main(
     constants_directory: Annotated[Path, typer.Option(..., "--constants", "-c")] = Path(
         "constant"
     ),
+    resume: Annotated[bool, typer.Option("--resume")] = False,
+    events_target: Annotated[
+        str | None, typer.Option("--events", metavar="FILE|FD")
+    ] = None,
+    emit: Annotated[str, typer.Option("--emit", metavar="TARGET,...")] = ",".join(
+        DEFAULT_TARGETS
+    ),
+    emit_directory: Annotated[Path, typer.Option("--emit-dir")] = (
+        DEFAULT_EMIT_DIRECTORY
+    ),
+    cache_directory: Annotated[Path | None, typer.Option("--cache-dir")] = None,
+    cache_max_mb: Annotated[int, typer.Option("--cache-max-mb")] = (
+        DEFAULT_CACHE_MAX_MB
+    ),
+    executor_kind: Annotated[ExecutorKind, typer.Option("--executor")] = (
+        ExecutorKind.SERIAL
+    ),
+    jobs: Annotated[int | None, typer.Option("--jobs", "-j")] = None,
+    sample_text: Annotated[
+        str, typer.Option("--sample", metavar="full|pairwise|random:N")
+    ] = str(FULL_SAMPLE),
 ):
-    copy_constants(constants_directory, output_directory)
-    generate_kicad_objects(
-        definitions_directory, generators_directory, output_directory
+    if ctx.invoked_subcommand is not None:
+        return
+
+    # Logs & progress bars go to stderr when stdout carries the event stream
+    console = rich.console.Console(stderr=writes_to_stdout(events_target))
+    configure_logging(console)
+
+    if executor_kind == ExecutorKind.THREAD and is_gil_enabled():
+        logger.warning(
+            "The GIL is enabled, --executor thread only runs generators in "
+            "parallel on a free-threaded Python build"
+        )
+
+    try:
+        target_names = parse_target_names(emit)
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--emit")
+
+    try:
+        sample = parse_sample(sample_text)
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--sample")
+
+    journal_path = output_directory / CHECKPOINT_FILE_NAME
+    if resume and journal_path.exists():
+        logger.info(f"Resuming from checkpoint: {journal_path}")
+    else:
+        resume = False
+        copy_constants(constants_directory, output_directory)
+
+    cache = None
+    if cache_directory is not None:
+        cache = ArtifactCache(cache_directory, cache_max_mb * 1024 * 1024)
+
+    events = EventStream()
+    with (
+        CheckpointJournal(journal_path, resume=resume) as journal,
+        rich.progress.Progress(console=console) as progress,
+        contextlib.ExitStack() as stack,
+        create_executor(executor_kind, jobs) as executor,
+    ):
+        events.subscribe(ProgressRenderer(progress))
+        if events_target is not None:
+            events.subscribe(stack.enter_context(JsonlEventWriter(events_target)))
+
+        failures = generate_kicad_objects(
+            definitions_directory,
+            generators_directory,
+            output_directory,
+            journal,
+            events,
+            target_names,
+            emit_directory,
+            cache,
+            executor,
+            sample,
+        )
+
+    write_manifest(output_directory)
+
+    if cache is not None:
+        evicted = cache.collect_garbage()
+        if evicted > 0:
+            logger.info(f"Evicted {evicted} least recently used cache entries")
+
+    if len(failures) > 0:
+        report_failures(failures)
+        raise typer.Exit(code=1)
+
+
+@cli.command()
+def check(
+    library_directory: Annotated[Path, typer.Argument()] = Path("generated"),
+):
+    """
+    Run design-rule checks across every footprint in a generated library.
+    """
+    footprint_paths = find_footprint_files(library_directory)
+    footprints = [
+        read_footprint(footprint_path)
+        for footprint_path in rich.progress.track(
+            footprint_paths, description="Reading footprints", transient=True
+        )
+    ]
+
+    violations = check_footprints(footprints)
+    for violation in violations:
+        logger.error(f"{violation.footprint}: [{violation.rule}] {violation.message}")
+
+    failing_footprints = len({violation.footprint for violation in violations})
+    logger.info(
+        f"Checked {len(footprints)} footprints, "
+        f"{failing_footprints} with {len(violations)} violations"
     )
 
+    if len(violations) > 0:
+        raise typer.Exit(code=1)
 
-def generate_kicad_objects(
-    definitions_directory, generators_directory, output_directory
+
+@cli.command()
+def preview(
+    library_directory: Annotated[Path, typer.Argument()] = Path("generated"),
+    preview_directory: Annotated[Path, typer.Option("--output", "-o")] = Path(
+        "previews"
+    ),
+    cache_directory: Annotated[Path, typer.Option("--cache")] = Path(".cache/previews"),
+    jobs: Annotated[int | None, typer.Option("--jobs", "-j")] = None,
 ):
-    files_in_definition_dir: list[Path] = list(definitions_directory.rglob("*.*"))
-    yaml_paths = list(filter(is_yaml_file, files_in_definition_dir))
+    """
+    Render SVG previews & a contact sheet for every footprint library.
+    """
+    previews = render_library_previews(
+        library_directory, preview_directory, cache_directory, jobs
+    )
+    cache_hits = sum(rendered.cache_hit for rendered in previews)
+    logger.info(
+        f"Rendered {len(previews) - cache_hits} previews into {preview_directory} "
+        f"({cache_hits} unchanged footprints served from cache)"
+    )
+
+
+@cli.command()
+def diff(
+    old_directory: Annotated[Path, typer.Argument(metavar="OLD")],
+    new_directory: Annotated[Path, typer.Argument(metavar="NEW")],
+    release_notes_path: Annotated[Path | None, typer.Option("--output", "-o")] = None,
+):
+    """
+    Summarise the footprints added, removed or changed between two libraries.
+    """
+    library_diff = diff_libraries(old_directory, new_directory)
+    release_notes = format_release_notes(library_diff)
+
+    if release_notes_path is None:
+        typer.echo(release_notes, nl=False)
+    else:
+        release_notes_path.write_text(release_notes)
+        logger.info(
+            f"{len(library_diff.added)} added, {len(library_diff.removed)} removed, "
+            f"{len(library_diff.changed)} changed, written to {release_notes_path}"
+        )
 
-    for yaml_path in rich.progress.track(
-        yaml_paths, description="Processing definition files"
-    ):
-        with open(yaml_path) as yaml_file:
-            definition_dict = yaml.load(yaml_file, Loader=SafeLoader)
 
-            generator_file = get_path_in_relative_directory(
-                generators_directory, definition_dict["generator"]
+@cli.command()
+def benchmark(
+    definitions_directory: Annotated[Path, typer.Option("--definitions", "-d")] = Path(
+        "definitions"
+    ),
+    generators_directory: Annotated[
+        Path, typer.Option(..., "--generators", "-g")
+    ] = Path("src/mckrl/generators"),
+    executor_kinds: Annotated[
+        list[ExecutorKind] | None, typer.Option("--executor")
+    ] = None,
+    jobs: Annotated[int | None, typer.Option("--jobs", "-j")] = None,
+    repeat: Annotated[int, typer.Option("--repeat", "-r")] = 3,
+):
+    """
+    Time full generation runs with each executor, compares the process & thread
+    pools by default.
+    """
+    if executor_kinds is None:
+        executor_kinds = [ExecutorKind.PROCESS, ExecutorKind.THREAD]
+
+    gil = "enabled" if is_gil_enabled() else "disabled"
+    logger.info(f"Python {platform.python_version()} with the GIL {gil}")
+
+    results = []
+    for executor_kind in executor_kinds:
+        durations = []
+        for _ in range(repeat):
+            with tempfile.TemporaryDirectory() as temporary_directory:
+                output_directory = Path(temporary_directory)
+                run_start = time.perf_counter()
+                with (
+                    CheckpointJournal(
+                        output_directory / CHECKPOINT_FILE_NAME, resume=False
+                    ) as journal,
+                    create_executor(executor_kind, jobs) as executor,
+                ):
+                    failures = generate_kicad_objects(
+                        definitions_directory,
+                        generators_directory,
+                        output_directory,
+                        journal,
+                        EventStream(),
+                        executor=executor,
+                    )
+                durations.append(time.perf_counter() - run_start)
+
+            if len(failures) > 0:
+                report_failures(failures)
+                raise typer.Exit(code=1)
+
+        results.append((executor_kind, durations))
+
+    for executor_kind, durations in results:
+        logger.info(
+            f"{executor_kind}: best {min(durations):.2f}s, "
+            f"median {statistics.median(durations):.2f}s over {repeat} runs"
+        )
+
+
+class GenerationFailure(NamedTuple):
+    yaml_path: Path
+    error_type: str
+    message: str
+
+
+class PendingDefinition(NamedTuple):
+    key: str
+    cache_key: str | None
+    roots: dict[str, Path]
+    future: Future
+
+
+def load_definition_file(
+    yaml_path: Path,
+    definitions_directory: Path,
+    generators_directory: Path,
+    output_directory: Path,
+    target_names: list[str] | None = None,
+    emit_directory: Path = DEFAULT_EMIT_DIRECTORY,
+    loader: DefinitionLoader | None = None,
+    sample: Sample = FULL_SAMPLE,
+):
+    if loader is None:
+        loader = DefinitionLoader()
+    definition_dict = loader.load(yaml_path)
+
+    generator_file = get_path_in_relative_directory(
+        generators_directory, definition_dict["generator"]
+    )
+
+    # TODO: forward do not work on Windows
+    module_path = os.path.splitext(
+        os.path.basename(generators_directory)
+        + "/"
+        + os.path.relpath(generator_file, generators_directory)
+    )[0]
+    module_name = str(module_path).replace("/", ".")
+    module = load_python_module_from_file(module_name, generator_file)
+
+    model = create_validation_model(module.generate)
+    validate(definition_dict, model.model_json_schema())
+
+    yaml_path_relative_to_definitions = yaml_path.relative_to(definitions_directory)
+    output_directory_for_yaml_generated_resources = (
+        output_directory.resolve() / yaml_path_relative_to_definitions.parent
+    )
+    output_directory_for_yaml_generated_resources.mkdir(parents=True, exist_ok=True)
+
+    base_dict: dict[str, Any] = {
+        "output_dir": output_directory_for_yaml_generated_resources
+    }
+
+    if target_names is not None and target_names != DEFAULT_TARGETS:
+        if "targets" not in inspect.signature(module.generate).parameters:
+            raise ValueError(
+                f"Generator {definition_dict['generator']} does not support --emit"
+            )
+        # KiCad footprint targets keep writing into the main output directory,
+        # every other target gets its own tree under the emit directory
+        base_dict["targets"] = [
+            create_target(
+                name,
+                output_directory_for_yaml_generated_resources
+                if name in LIBRARY_TARGETS
+                else emit_directory.resolve()
+                / name
+                / yaml_path_relative_to_definitions.parent,
             )
+            for name in target_names
+        ]
+
+    definitions = compute_all_definitions(
+        definition_dict, base_dict, loader.combinations(yaml_path)
+    )
+    if sample != FULL_SAMPLE:
+        sampled_definitions = sample_definitions(
+            definitions, sample, seed=yaml_path_relative_to_definitions.as_posix()
+        )
+        logger.info(
+            f"Sampled {len(sampled_definitions)} of {len(definitions)} definitions "
+            f"in {yaml_path_relative_to_definitions} ({sample})"
+        )
+        definitions = sampled_definitions
 
-            # TODO: forward do not work on Windows
-            module_path = os.path.splitext(
-                os.path.basename(generators_directory)
-                + "/"
-                + os.path.relpath(generator_file, generators_directory)
-            )[0]
-            module_name = str(module_path).replace("/", ".")
-            module = load_python_module_from_file(module_name, generator_file)
+    return module, generator_file, definitions
 
-            model = create_validation_model(module.generate)
-            validate(definition_dict, model.model_json_schema())
 
-            yaml_path_relative_to_definitions = yaml_path.relative_to(
-                definitions_directory
+def normalise_output_paths(generate_result: Any) -> list[Path]:
+    # Generators may return nothing, a single written path or a list of them
+    if generate_result is None:
+        return []
+    if isinstance(generate_result, (str, Path)):
+        return [Path(generate_result)]
+    return [Path(path) for path in generate_result]
+
+
+def run_generator(
+    module_name: str, generator_file: Path, definition: dict
+) -> tuple[list[Path], float]:
+    """
+    Runs a single generate() call, the generator module is looked up by name so
+    this works the same in worker threads & worker processes.
+    """
+    module = load_python_module_from_file(module_name, generator_file)
+    generate_start = time.perf_counter()
+    output_paths = normalise_output_paths(module.generate(**definition))
+    return output_paths, time.perf_counter() - generate_start
+
+
+def output_roots(definition: dict) -> dict[str, Path]:
+    roots = {"output_dir": Path(definition["output_dir"])}
+    for target in definition.get("targets", []):
+        roots[str(target)] = target.directory
+    return roots
+
+
+def generate_kicad_objects(
+    definitions_directory,
+    generators_directory,
+    output_directory,
+    journal,
+    events,
+    target_names: list[str] | None = None,
+    emit_directory: Path = DEFAULT_EMIT_DIRECTORY,
+    cache: ArtifactCache | None = None,
+    executor: Executor | None = None,
+    sample: Sample = FULL_SAMPLE,
+) -> list[GenerationFailure]:
+    if executor is None:
+        executor = SerialExecutor()
+    files_in_definition_dir: list[Path] = list(definitions_directory.rglob("*.*"))
+    yaml_paths = [
+        path
+        for path in files_in_definition_dir
+        if is_yaml_file(path) and not is_fragment_file(path)
+    ]
+    failures: list[GenerationFailure] = []
+    # Shared fragments are read & expanded once for the whole run
+    loader = DefinitionLoader()
+
+    def record_result(definition_file: Path, result: PendingDefinition):
+        journal_file = definition_file.as_posix()
+        try:
+            output_paths, duration = result.future.result()
+        except Exception as e:
+            failures.append(
+                GenerationFailure(definition_file, type(e).__name__, str(e))
+            )
+            events.emit(
+                "error",
+                file=journal_file,
+                definition=result.key,
+                error_type=type(e).__name__,
+                message=str(e),
+            )
+            return
+
+        if cache is not None and result.cache_key is not None and len(output_paths) > 0:
+            cache.publish(result.cache_key, result.roots, output_paths)
+
+        journal.record(journal_file, result.key)
+        events.emit(
+            "footprint_generated",
+            file=journal_file,
+            definition=result.key,
+            duration=round(duration, 6),
+            bytes=sum(os.path.getsize(path) for path in output_paths),
+        )
+
+    events.emit("run_started", files=len(yaml_paths))
+
+    for yaml_path in yaml_paths:
+        yaml_path_relative_to_definitions = yaml_path.relative_to(definitions_directory)
+        journal_file = yaml_path_relative_to_definitions.as_posix()
+        events.emit("file_started", file=journal_file)
+
+        try:
+            module, generator_file, definitions = load_definition_file(
+                yaml_path,
+                definitions_directory,
+                generators_directory,
+                output_directory,
+                target_names,
+                emit_directory,
+                loader,
+                sample,
             )
-            output_directory_for_yaml_generated_resources = (
-                output_directory.resolve() / yaml_path_relative_to_definitions.parent
+        except Exception as e:
+            logger.error(f"Failed to load {yaml_path_relative_to_definitions}: {e}")
+            failures.append(
+                GenerationFailure(
+                    yaml_path_relative_to_definitions, type(e).__name__, str(e)
+                )
             )
-            output_directory_for_yaml_generated_resources.mkdir(
-                parents=True, exist_ok=True
+            events.emit(
+                "error", file=journal_file, error_type=type(e).__name__, message=str(e)
             )
+            events.emit("file_finished", file=journal_file)
+            continue
 
-            base_dict = {"output_dir": output_directory_for_yaml_generated_resources}
-            definitions = compute_all_definitions(definition_dict, base_dict)
+        logger.info(
+            f"Found {len(definitions)} definitions in {yaml_path_relative_to_definitions}",
+        )
+        events.emit(
+            "definitions_expanded", file=journal_file, definitions=len(definitions)
+        )
 
-            logger.info(
-                f"Found {len(definitions)} definitions in {yaml_path_relative_to_definitions}",
+        # Results are recorded in submission order as soon as the oldest one is
+        # done, serial runs record each footprint before generating the next & at
+        # most MAX_PENDING_DEFINITIONS are ever waited on, so the journal, cache &
+        # events keep advancing per footprint without touching them off thread
+        pending: collections.deque[PendingDefinition] = collections.deque()
+        for definition in definitions:
+            key = definition_key(definition)
+            if journal.is_complete(journal_file, key):
+                events.emit(
+                    "cache_hit", file=journal_file, definition=key, source="checkpoint"
+                )
+                continue
+
+            cache_key, roots = None, output_roots(definition)
+            if cache is not None:
+                cache_key = artifact_key(key, generator_file)
+                if cache.restore(cache_key, roots) is not None:
+                    journal.record(journal_file, key)
+                    events.emit(
+                        "cache_hit", file=journal_file, definition=key, source="cache"
+                    )
+                    continue
+
+            future = executor.submit(
+                run_generator, module.__name__, generator_file, definition
             )
+            pending.append(PendingDefinition(key, cache_key, roots, future))
+
+            while len(pending) > 0 and (
+                pending[0].future.done() or len(pending) >= MAX_PENDING_DEFINITIONS
+            ):
+                record_result(yaml_path_relative_to_definitions, pending.popleft())
+
+        while len(pending) > 0:
+            record_result(yaml_path_relative_to_definitions, pending.popleft())
+
+        events.emit("file_finished", file=journal_file)
+
+    events.emit("run_finished", failures=len(failures))
+
+    return failures
 
-            for definition in rich.progress.track(definitions, transient=True):
-                module.generate(**definition)
+
+def report_failures(failures: list[GenerationFailure]):
+    grouped: dict[tuple[Path, str], list[str]] = {}
+    for failure in failures:
+        grouped.setdefault((failure.yaml_path, failure.error_type), []).append(
+            failure.message
+        )
+
+    for (yaml_path, error_type), messages in sorted(grouped.items()):
+        logger.error(
+            f"{yaml_path}: {len(messages)}x {error_type}: "
+            + "; ".join(sorted(set(messages)))
+        )
+
+    logger.error(
+        f"{len(failures)} failures across "
+        f"{len({failure.yaml_path for failure in failures})} definition files"
+    )
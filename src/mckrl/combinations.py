@@ -0,0 +1,144 @@
+# SPDX-License-Identifier: Apache-2.0
+
+import itertools
+import json
+import random
+from typing import Any, Final, NamedTuple
+
+from mckrl.rules import CombinationRules, split_combination_rules
+
+
+# TODO: The terms combination & combination set can be confusing and as such should be renamed
+#       The "combinations" block in our yaml files, contain multiple "combination sets" which
+#       are evaluated independently for all possible combinations and then combined
+def get_combinations_for_combination_set(
+    combination_set: dict[str, list],
+    rules: CombinationRules | None = None,
+) -> list[dict[str, Any]]:
+    if len(combination_set) == 0:
+        return []
+    all_combinations = [{}]
+    for key, values in combination_set.items():
+        combinations = []
+        for value in values:
+
+            def combination_creator(combination):
+                return {**combination, key: value}
+
+            combinations.extend(map(combination_creator, all_combinations))
+
+        # Prune as soon as a rule can be decided so excluded branches are never
+        # expanded any further
+        if rules:
+            combinations = [
+                combination
+                for combination in combinations
+                if rules.allows(combination, complete=False)
+            ]
+        all_combinations = combinations
+    return all_combinations
+
+
+def get_combinations_with_rules(
+    combinations: list[dict[str, Any]],
+) -> list[tuple[dict[str, Any], CombinationRules]]:
+    all_combinations = []
+    for combination_set in combinations:
+        combination_values, rules = split_combination_rules(combination_set)
+        all_combinations += [
+            (combination, rules)
+            for combination in get_combinations_for_combination_set(
+                combination_values, rules
+            )
+        ]
+
+    return all_combinations
+
+
+def get_combinations(combinations: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return [combination for combination, _ in get_combinations_with_rules(combinations)]
+
+
+class Sample(NamedTuple):
+    mode: str
+    size: int | None = None
+
+    def __str__(self):
+        return self.mode if self.size is None else f"{self.mode}:{self.size}"
+
+
+FULL_SAMPLE: Final[Sample] = Sample("full")
+SAMPLE_MODES: Final[tuple[str, ...]] = ("full", "pairwise", "random")
+
+
+def parse_sample(text: str) -> Sample:
+    mode, _, size = text.strip().partition(":")
+    if mode not in SAMPLE_MODES:
+        raise ValueError(
+            f"Unsupported sample '{text}' (supported: full, pairwise, random:N)"
+        )
+    if mode != "random":
+        if size != "":
+            raise ValueError(f"Sample '{mode}' does not take a size")
+        return Sample(mode)
+    if not size.isdigit() or int(size) == 0:
+        raise ValueError("Random samples need a positive size, e.g. random:20")
+    return Sample(mode, int(size))
+
+
+def _value_key(value: Any) -> str:
+    # Parameter values are not necessarily hashable (e.g. injected targets)
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+def get_pairwise_definitions(definitions: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Greedily picks a covering array out of the fully expanded definitions, every
+    value & every pair of values of the parameters that vary appears in at least
+    one picked definition. Picking from the expanded definitions means rules are
+    always respected, the picked definitions keep their original order.
+    """
+    parameters = sorted({key for definition in definitions for key in definition})
+    varying_parameters = [
+        parameter
+        for parameter in parameters
+        if len({_value_key(definition.get(parameter)) for definition in definitions})
+        > 1
+    ]
+
+    def interactions(definition: dict[str, Any]) -> set[tuple]:
+        values = [
+            (parameter, _value_key(definition.get(parameter)))
+            for parameter in varying_parameters
+        ]
+        return {(value,) for value in values} | set(itertools.combinations(values, 2))
+
+    definition_interactions = [interactions(definition) for definition in definitions]
+    uncovered: set[tuple] = set().union(*definition_interactions)
+    picked = [0] if len(uncovered) == 0 and len(definitions) > 0 else []
+
+    while len(uncovered) > 0:
+        best = max(
+            range(len(definitions)),
+            key=lambda index: len(definition_interactions[index] & uncovered),
+        )
+        picked.append(best)
+        uncovered -= definition_interactions[best]
+
+    return [definitions[index] for index in sorted(picked)]
+
+
+def sample_definitions(
+    definitions: list[dict[str, Any]], sample: Sample, seed: str = ""
+) -> list[dict[str, Any]]:
+    match sample.mode:
+        case "pairwise":
+            return get_pairwise_definitions(definitions)
+        case "random":
+            # Seeded so a sampled build picks the same definitions every run
+            picked = random.Random(seed).sample(
+                range(len(definitions)), min(sample.size or 0, len(definitions))
+            )
+            return [definitions[index] for index in sorted(picked)]
+        case _:
+            return definitions
@@ -0,0 +1,188 @@
+# SPDX-License-Identifier: Apache-2.0
+
+import itertools
+from pathlib import Path
+from typing import Any, Final
+
+import yaml
+from yaml.loader import SafeLoader
+
+from mckrl.combinations import get_combinations_for_combination_set
+from mckrl.rules import RULE_KEYS, CombinationRules, split_combination_rules
+
+EXTENDS_KEY: Final[str] = "extends"
+INCLUDE_KEY: Final[str] = "include"
+# Definition files starting with this prefix only hold shared fragments & are
+# never generated on their own
+FRAGMENT_PREFIX: Final[str] = "_"
+
+Combinations = list[tuple[dict[str, Any], CombinationRules]]
+
+
+class DefinitionCycleError(ValueError):
+    pass
+
+
+def is_fragment_file(path: Path) -> bool:
+    return path.name.startswith(FRAGMENT_PREFIX)
+
+
+def _as_list(value: Any) -> list:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _merge_documents(base: dict, override: dict) -> dict:
+    merged = base | override
+    if "defaults" in base and "defaults" in override:
+        merged["defaults"] = base["defaults"] | override["defaults"]
+    return merged
+
+
+def _merge_combination_sets(combination_sets: tuple[dict, ...]) -> dict:
+    merged: dict[str, Any] = {}
+    for combination_set in combination_sets:
+        for key, value in combination_set.items():
+            if key in RULE_KEYS:
+                merged[key] = merged.get(key, []) + value
+            else:
+                merged[key] = value
+    return merged
+
+
+class DefinitionLoader:
+    """
+    Reads definition files along with the fragments they share, `extends:` pulls
+    in whole documents (defaults merged key by key, any other key of the file
+    replacing the inherited one) & `include:` inside a combination set combines
+    it with every combination of the included fragment.
+
+    Every file is read & resolved once per loader & the combinations of each
+    fragment are expanded once, so a single loader should be shared by a run.
+    """
+
+    def __init__(self):
+        self.__documents: dict[Path, dict] = {}
+        self.__combinations: dict[Path, Combinations] = {}
+        self.__resolving: list[Path] = []
+
+    def __resolve(self, path: Path) -> dict:
+        path = path.resolve()
+        if path in self.__documents:
+            return self.__documents[path]
+        if path in self.__resolving:
+            cycle = self.__resolving[self.__resolving.index(path) :] + [path]
+            raise DefinitionCycleError(
+                "Definition files extend or include each other in a cycle: "
+                + " -> ".join(cycle_path.name for cycle_path in cycle)
+            )
+
+        self.__resolving.append(path)
+        try:
+            with open(path) as yaml_file:
+                document = yaml.load(yaml_file, Loader=SafeLoader) or {}
+
+            # Included fragments are located relative to the file naming them,
+            # not to whichever file ends up inheriting the combination set
+            combination_sets = []
+            for combination_set in document.get("combinations", []):
+                included = _as_list(combination_set.get(INCLUDE_KEY))
+                if len(included) > 0:
+                    included_paths = [
+                        (path.parent / included_path).resolve()
+                        for included_path in included
+                    ]
+                    for included_path in included_paths:
+                        self.__resolve(included_path)
+                    combination_set = combination_set | {INCLUDE_KEY: included_paths}
+                combination_sets.append(combination_set)
+            if "combinations" in document:
+                document["combinations"] = combination_sets
+
+            resolved: dict = {}
+            for parent in _as_list(document.pop(EXTENDS_KEY, None)):
+                resolved = _merge_documents(
+                    resolved, self.__resolve(path.parent / parent)
+                )
+            resolved = _merge_documents(resolved, document)
+        finally:
+            self.__resolving.pop()
+
+        self.__documents[path] = resolved
+        return resolved
+
+    def __splice(self, combination_set: dict) -> list[dict]:
+        included = combination_set.get(INCLUDE_KEY)
+        if included is None:
+            return [combination_set]
+
+        local = {
+            key: value for key, value in combination_set.items() if key != INCLUDE_KEY
+        }
+        included_sets = [
+            [
+                spliced
+                for fragment_set in self.__resolve(included_path).get(
+                    "combinations", []
+                )
+                for spliced in self.__splice(fragment_set)
+            ]
+            for included_path in included
+        ]
+        return [
+            _merge_combination_sets((local, *fragment_sets))
+            for fragment_sets in itertools.product(*included_sets)
+        ]
+
+    def load(self, path: Path) -> dict:
+        """
+        Returns the fully resolved document, included combination sets are
+        written out in place so the result validates like a plain definition.
+        """
+        document = dict(self.__resolve(path))
+        if "combinations" in document:
+            document["combinations"] = [
+                spliced
+                for combination_set in document["combinations"]
+                for spliced in self.__splice(combination_set)
+            ]
+        return document
+
+    def __expand(self, combination_set: dict) -> Combinations:
+        local = {
+            key: value for key, value in combination_set.items() if key != INCLUDE_KEY
+        }
+        values, rules = split_combination_rules(local)
+        expanded = [({}, rules)]
+        if len(values) > 0 or INCLUDE_KEY not in combination_set:
+            expanded = [
+                (combination, rules)
+                for combination in get_combinations_for_combination_set(values, rules)
+            ]
+
+        # Keys of the including set vary fastest, as they would when expanding the
+        # spliced combination set
+        for included_path in combination_set.get(INCLUDE_KEY, []):
+            combined = []
+            for fragment_combination, fragment_rules in self.combinations(
+                included_path
+            ):
+                for combination, rules in expanded:
+                    merged_rules = rules.combined_with(fragment_rules)
+                    merged = combination | fragment_combination
+                    if merged_rules.allows(merged, complete=False):
+                        combined.append((merged, merged_rules))
+            expanded = combined
+
+        return expanded
+
+    def combinations(self, path: Path) -> Combinations:
+        path = path.resolve()
+        if path not in self.__combinations:
+            self.__combinations[path] = [
+                expanded
+                for combination_set in self.__resolve(path).get("combinations", [])
+                for expanded in self.__expand(combination_set)
+            ]
+        return self.__combinations[path]
@@ -0,0 +1,232 @@
+# SPDX-License-Identifier: Apache-2.0
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Final, NamedTuple
+
+from mckrl.kicad_mod import (
+    FootprintGeometry,
+    PadGeometry,
+    content_hash,
+    find_footprint_files,
+    read_footprint,
+)
+from mckrl.manifest import read_manifest
+
+POSITION_TOLERANCE_MM: Final[float] = 1e-6
+
+
+class LibraryDiff(NamedTuple):
+    added: list[str]
+    removed: list[str]
+    changed: dict[str, list[str]]
+    unchanged: int
+
+
+def _library_paths(library_directory: Path, index: dict[str, str] | None) -> set[str]:
+    if index is not None:
+        return set(index)
+    return {
+        path.relative_to(library_directory).as_posix()
+        for path in find_footprint_files(library_directory)
+    }
+
+
+def _find_changed_paths(
+    paths: list[str],
+    old_directory: Path,
+    new_directory: Path,
+    old_index: dict[str, str] | None,
+    new_index: dict[str, str] | None,
+) -> list[str]:
+    if old_index is not None and new_index is not None:
+        return [path for path in paths if old_index[path] != new_index[path]]
+
+    # Without both manifests a differing size is enough to know a footprint has
+    # changed, only same sized footprints have to be read & hashed
+    changed = []
+    candidates = []
+    for path in paths:
+        old_size = (old_directory / path).stat().st_size
+        new_size = (new_directory / path).stat().st_size
+        if old_size != new_size:
+            changed.append(path)
+        else:
+            candidates.append(path)
+
+    def lookup_hash(directory: Path, index: dict[str, str] | None, path: str) -> str:
+        if index is not None:
+            return index[path]
+        return content_hash((directory / path).read_text())
+
+    def has_changed(path: str) -> bool:
+        return lookup_hash(old_directory, old_index, path) != lookup_hash(
+            new_directory, new_index, path
+        )
+
+    with ThreadPoolExecutor() as executor:
+        for path, path_changed in zip(
+            candidates, executor.map(has_changed, candidates)
+        ):
+            if path_changed:
+                changed.append(path)
+
+    return sorted(changed)
+
+
+def _format_drill(pad: PadGeometry) -> str:
+    return "no drill" if pad.drill is None else f"{pad.drill:g}mm"
+
+
+def _pair_pads(
+    old_pads: list[PadGeometry], new_pads: list[PadGeometry]
+) -> tuple[list[tuple[PadGeometry, PadGeometry]], list[PadGeometry], list[PadGeometry]]:
+    def group(pads: list[PadGeometry]) -> dict[str, list[PadGeometry]]:
+        grouped: dict[str, list[PadGeometry]] = {}
+        for pad in sorted(pads, key=lambda pad: (pad.x, pad.y)):
+            grouped.setdefault(pad.number, []).append(pad)
+        return grouped
+
+    old_grouped, new_grouped = group(old_pads), group(new_pads)
+    pairs, removed, added = [], [], []
+    for number in sorted(old_grouped.keys() | new_grouped.keys()):
+        old_group = old_grouped.get(number, [])
+        new_group = new_grouped.get(number, [])
+        pairs += zip(old_group, new_group)
+        removed += old_group[len(new_group) :]
+        added += new_group[len(old_group) :]
+
+    return pairs, removed, added
+
+
+def _diff_pad(old: PadGeometry, new: PadGeometry) -> list[str]:
+    label = old.label
+    changes = []
+
+    if (
+        abs(old.x - new.x) > POSITION_TOLERANCE_MM
+        or abs(old.y - new.y) > POSITION_TOLERANCE_MM
+    ):
+        changes.append(
+            f"{label} moved ({old.x:g}, {old.y:g}) -> ({new.x:g}, {new.y:g})"
+        )
+    if old.drill != new.drill:
+        changes.append(
+            f"{label} drill resized {_format_drill(old)} -> {_format_drill(new)}"
+        )
+    if (old.width, old.height) != (new.width, new.height):
+        changes.append(
+            f"{label} resized {old.width:g}x{old.height:g}mm -> "
+            f"{new.width:g}x{new.height:g}mm"
+        )
+    if (old.type, old.shape) != (new.type, new.shape):
+        changes.append(
+            f"{label} changed from {old.type} {old.shape} to {new.type} {new.shape}"
+        )
+    if old.layers != new.layers:
+        changes.append(
+            f"{label} layers changed {' '.join(old.layers)} -> {' '.join(new.layers)}"
+        )
+
+    return changes
+
+
+def _diff_properties(old: dict[str, str], new: dict[str, str]) -> list[str]:
+    changes = []
+    removed = {key: old[key] for key in old.keys() - new.keys()}
+    added = {key: new[key] for key in new.keys() - old.keys()}
+
+    for old_key, value in sorted(removed.items()):
+        renamed_to = next((key for key, v in sorted(added.items()) if v == value), None)
+        if renamed_to is not None:
+            changes.append(f"property '{old_key}' renamed to '{renamed_to}'")
+            del added[renamed_to]
+        else:
+            changes.append(f"property '{old_key}' removed")
+
+    for key in sorted(added):
+        changes.append(f"property '{key}' added")
+
+    for key in sorted(old.keys() & new.keys()):
+        if old[key] != new[key]:
+            changes.append(f"property '{key}' changed '{old[key]}' -> '{new[key]}'")
+
+    return changes
+
+
+def diff_footprints(old: FootprintGeometry, new: FootprintGeometry) -> list[str]:
+    changes = []
+
+    if old.name != new.name:
+        changes.append(f"renamed {old.name} -> {new.name}")
+    if old.description != new.description:
+        changes.append("description changed")
+    if old.tags != new.tags:
+        changes.append(f"tags changed '{old.tags}' -> '{new.tags}'")
+
+    changes += _diff_properties(old.properties, new.properties)
+
+    pairs, removed, added = _pair_pads(old.pads, new.pads)
+    for old_pad, new_pad in pairs:
+        changes += _diff_pad(old_pad, new_pad)
+    changes += [f"{pad.label} removed" for pad in removed]
+    changes += [f"{pad.label} added" for pad in added]
+
+    for layer in sorted({line.layer for line in old.lines + new.lines}):
+        old_segments = {(line.start, line.end) for line in old.lines_on_layer(layer)}
+        new_segments = {(line.start, line.end) for line in new.lines_on_layer(layer)}
+        if old_segments != new_segments:
+            changes.append(f"{layer} outline changed")
+
+    return changes
+
+
+def diff_libraries(old_directory: Path, new_directory: Path) -> LibraryDiff:
+    old_index, new_index = read_manifest(old_directory), read_manifest(new_directory)
+    old_paths = _library_paths(old_directory, old_index)
+    new_paths = _library_paths(new_directory, new_index)
+    common_paths = sorted(old_paths & new_paths)
+
+    changed_paths = _find_changed_paths(
+        common_paths, old_directory, new_directory, old_index, new_index
+    )
+
+    def diff_path(path: str) -> list[str]:
+        changes = diff_footprints(
+            read_footprint(old_directory / path), read_footprint(new_directory / path)
+        )
+        return changes or ["file changed with no geometry or property changes"]
+
+    with ThreadPoolExecutor() as executor:
+        changes = list(executor.map(diff_path, changed_paths))
+
+    return LibraryDiff(
+        added=sorted(new_paths - old_paths),
+        removed=sorted(old_paths - new_paths),
+        changed=dict(zip(changed_paths, changes)),
+        unchanged=len(common_paths) - len(changed_paths),
+    )
+
+
+def format_release_notes(library_diff: LibraryDiff) -> str:
+    lines = ["# Footprint changes", ""]
+
+    for heading, paths in [
+        ("Added", library_diff.added),
+        ("Removed", library_diff.removed),
+    ]:
+        if len(paths) > 0:
+            lines += [f"## {heading} ({len(paths)})", ""]
+            lines += [f"- `{path}`" for path in paths]
+            lines.append("")
+
+    if len(library_diff.changed) > 0:
+        lines += [f"## Changed ({len(library_diff.changed)})", ""]
+        for path, changes in library_diff.changed.items():
+            lines.append(f"- `{path}`")
+            lines += [f"  - {change}" for change in changes]
+        lines.append("")
+
+    lines.append(f"{library_diff.unchanged} footprints unchanged.")
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,116 @@
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import sys
+import time
+from typing import Callable, Final, TextIO
+
+import rich.progress
+
+# Events that mark the end of a unit of work, buffered output is flushed on these
+# so anything tailing the stream sees whole files rather than partial progress
+FLUSH_EVENTS: Final[set[str]] = {"file_finished", "error", "run_finished"}
+
+# Minimum time between redraws of the progress bars, in seconds
+PROGRESS_REFRESH_INTERVAL: Final[float] = 0.1
+
+STDOUT_TARGET: Final[str] = "-"
+
+
+class EventStream:
+    """
+    Fans run events out to subscribers, every event is a flat dict carrying its
+    name under "event" & the seconds since the stream was created under "t".
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.subscribers: list[Callable[[dict], None]] = []
+
+    def subscribe(self, subscriber: Callable[[dict], None]):
+        self.subscribers.append(subscriber)
+
+    def emit(self, event: str, **fields):
+        record = {
+            "event": event,
+            "t": round(time.perf_counter() - self.start, 6),
+            **fields,
+        }
+        for subscriber in self.subscribers:
+            subscriber(record)
+
+
+def writes_to_stdout(target: str | None) -> bool:
+    # Console output has to move out of the way of events written to stdout
+    return target == STDOUT_TARGET or (
+        target is not None and target.isdigit() and int(target) == 1
+    )
+
+
+def open_event_target(target: str) -> TextIO:
+    if target == STDOUT_TARGET:
+        return open(sys.stdout.fileno(), "w", closefd=False)
+    if target.isdigit():
+        return open(int(target), "w", closefd=False)
+    return open(target, "w")
+
+
+class JsonlEventWriter:
+    def __init__(self, target: str):
+        self.__file = open_event_target(target)
+
+    def __call__(self, record: dict):
+        self.__file.write(json.dumps(record, separators=(",", ":"), default=str) + "\n")
+        if record["event"] in FLUSH_EVENTS:
+            self.__file.flush()
+
+    def close(self):
+        self.__file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+
+class ProgressRenderer:
+    """
+    Draws rich progress bars from the event stream, footprint progress is
+    accumulated & only pushed to rich every PROGRESS_REFRESH_INTERVAL seconds so
+    the generation loop never waits on terminal output.
+    """
+
+    def __init__(self, progress: rich.progress.Progress):
+        self.progress = progress
+        self.files_task = progress.add_task("Processing definition files", total=None)
+        self.definitions_task = progress.add_task("", total=None, visible=False)
+        self.pending = 0
+        self.last_refresh = 0.0
+
+    def __flush(self):
+        self.progress.advance(self.definitions_task, self.pending)
+        self.pending = 0
+        self.last_refresh = time.perf_counter()
+
+    def __call__(self, record: dict):
+        match record["event"]:
+            case "run_started":
+                self.progress.update(self.files_task, total=record["files"])
+            case "definitions_expanded":
+                self.progress.reset(
+                    self.definitions_task,
+                    total=record["definitions"],
+                    description=record["file"],
+                    visible=True,
+                )
+            case "footprint_generated" | "cache_hit" | "error":
+                if "definition" not in record:
+                    return
+                self.pending += 1
+                if time.perf_counter() - self.last_refresh >= PROGRESS_REFRESH_INTERVAL:
+                    self.__flush()
+            case "file_finished":
+                self.__flush()
+                self.progress.update(self.definitions_task, visible=False)
+                self.progress.advance(self.files_task)
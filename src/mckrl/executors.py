@@ -0,0 +1,46 @@
+# SPDX-License-Identifier: Apache-2.0
+
+import sys
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from enum import StrEnum
+
+
+class ExecutorKind(StrEnum):
+    SERIAL = "serial"
+    THREAD = "thread"
+    PROCESS = "process"
+
+
+class SerialExecutor(Executor):
+    """
+    Runs each task as soon as it is submitted in the calling thread, so serial
+    runs go through the same code path as pooled ones.
+    """
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+def is_gil_enabled() -> bool:
+    # Only free-threaded aware builds can report the GIL being disabled
+    return getattr(sys, "_is_gil_enabled", lambda: True)()
+
+
+def create_executor(kind: ExecutorKind, jobs: int | None = None) -> Executor:
+    """
+    Thread pools share generator modules & definitions with the main thread &
+    only run in parallel on free-threaded builds, process pools pickle every
+    definition to their workers but scale on any build.
+    """
+    match kind:
+        case ExecutorKind.THREAD:
+            return ThreadPoolExecutor(max_workers=jobs)
+        case ExecutorKind.PROCESS:
+            return ProcessPoolExecutor(max_workers=jobs)
+        case _:
+            return SerialExecutor()
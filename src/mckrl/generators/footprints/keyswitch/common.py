@@ -1,8 +1,10 @@
 # SPDX-License-Identifier: Apache-2.0
 
+from pathlib import Path
 from typing import Literal
 from KicadModTree import (
     Footprint,
+    KicadFileHandler,
     Property,
     RoundRadiusHandler,
     Vector2D,
@@ -10,6 +12,7 @@ from KicadModTree import (
     RectLine,
 )
 
+from mckrl.targets import KicadTarget, OutputTarget, write_targets
 from .types import StabiliserParams
 
 
@@ -144,8 +147,12 @@ def add_npth_hole(
     centre: Vector2D,
     rotation: float,
     diameter: float,
-    rotation_origin: Vector2D = Vector2D(0, 0),
+    rotation_origin: Vector2D | None = None,
 ):
+    # A Vector2D default would be one mutable instance shared by every call
+    if rotation_origin is None:
+        rotation_origin = Vector2D(0, 0)
+
     kicad_mod.append(
         Pad(
             type=Pad.TYPE_NPTH,
@@ -167,8 +174,11 @@ def add_tht_hole(
     inner_diameter: float,
     pad_pin: int,
     pad_shape=Pad.SHAPE_CIRCLE,
-    rotation_origin: Vector2D = Vector2D(0, 0),
+    rotation_origin: Vector2D | None = None,
 ):
+    if rotation_origin is None:
+        rotation_origin = Vector2D(0, 0)
+
     kicad_mod.append(
         Pad(
             number=pad_pin,
@@ -194,5 +204,18 @@ def add_spacing_rectangle(
     footprint.append(rect_line.rotate(rotation))
 
 
+def write_footprint(
+    footprint: Footprint,
+    output_dir: str,
+    targets: list[OutputTarget] | None = None,
+) -> list[Path]:
+    # Serialise once & hand the same footprint to every target
+    if targets is None or len(targets) == 0:
+        targets = [KicadTarget(Path(output_dir))]
+
+    kicad_mod = KicadFileHandler(footprint).serialize()
+    return write_targets(footprint.name, kicad_mod, targets)
+
+
 def is_vowel(char: str):
     return char.lower() in ["a", "e", "i", "o", "u"]
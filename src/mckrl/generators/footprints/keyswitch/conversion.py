@@ -8,14 +8,14 @@ def get_switch_width_in_units(string: str) -> float:
 
 
 def string_to_millimetre_float(
-    measurement_string: str, alternate_unit_lookup: dict[str, float] = {}
+    measurement_string: str, alternate_unit_lookup: dict[str, float] | None = None
 ) -> float:
     unit_lookup = {
         "mm": 1,
         "cm": 10,
         "in": 25.4,
         "mils": 0.0254,
-        **alternate_unit_lookup,
+        **(alternate_unit_lookup or {}),
     }
 
     for unit_string, unit_multiplier in unit_lookup.items():
@@ -1,11 +1,9 @@
 # SPDX-License-Identifier: Apache-2.0
 
-from pathlib import Path
-
-
 from mckrl.generators.footprints.keyswitch.types import StabiliserParams
 from mckrl.generators.footprints.keyswitch import models, conversion, common
-from KicadModTree import Footprint, FootprintType, Vector2D, KicadFileHandler
+from mckrl.targets import OutputTarget
+from KicadModTree import Footprint, FootprintType, Vector2D
 
 
 def generate(
@@ -21,6 +19,7 @@ def generate(
     stabiliser_type: str | None = None,
     stabiliser_size: str | None = None,
     stabiliser_rotation: float = 0,
+    targets: list[OutputTarget] | None = None,
 ):
     # Validate both required stabiliser args are provided or neither
     if [stabiliser_type, stabiliser_size].count(None) == 1:
@@ -118,6 +117,4 @@ def generate(
     )
     common.add_footprint_labels(keyswitch_footprint, switch_spacing_mm)
 
-    file_handler = KicadFileHandler(keyswitch_footprint)
-    file_path = f"{output_dir}/{footprint_name}.kicad_mod"
-    file_handler.writeFile(Path(file_path))
+    return common.write_footprint(keyswitch_footprint, output_dir, targets)
@@ -1,7 +1,8 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from .keyswitch import Keyswitch
-from .. import common
+from ..plate import PLATE_LAYER
+from ..templates import PadTemplate, add_outline, add_pads, rectangle_outline
 from KicadModTree import Footprint, Vector2D, Pad, RectLine
 
 THT_PAD_DIAMETER = 2.54
@@ -12,6 +13,26 @@ LED_HOLE_DRILL = 1
 COURTYARD_WIDTH = 15.5
 COURTYARD_HEIGHT = 12.8
 
+# Solder pads
+SWITCH_PADS = (
+    PadTemplate(2.5, -4.5, THT_PAD_DIAMETER, THT_PAD_DRILL, number=1),
+    PadTemplate(-2.5, -4, THT_PAD_DIAMETER, THT_PAD_DRILL, number=2),
+)
+LED_PADS = (
+    PadTemplate(
+        -LED_SPACING,
+        4.6,
+        LED_HOLE_DIAMETER,
+        LED_HOLE_DRILL,
+        number=3,
+        shape=Pad.SHAPE_ROUNDRECT,
+    ),
+    PadTemplate(LED_SPACING, 4.6, LED_HOLE_DIAMETER, LED_HOLE_DRILL, number=4),
+)
+
+# Alps plates are cut to the switch body, the same size as its courtyard
+PLATE_CUTOUT = rectangle_outline(PLATE_LAYER, COURTYARD_WIDTH, COURTYARD_HEIGHT)
+
 
 class AlpsKeyswitch(Keyswitch):
     def __init__(
@@ -27,31 +48,13 @@ class AlpsKeyswitch(Keyswitch):
         self,
         footprint: Footprint,
     ):
-        # Create Solder pads for switch
-        common.add_tht_hole(
-            kicad_mod=footprint,
-            pad_pin=1,
-            centre=[2.5 + self.centre.x, -4.5],
-            diameter=THT_PAD_DIAMETER,
-            inner_diameter=THT_PAD_DRILL,
-            rotation=self.rotation,
-            rotation_origin=self.centre,
-        )
-
-        common.add_tht_hole(
-            kicad_mod=footprint,
-            pad_pin=2,
-            centre=[-2.5 + self.centre.x, -4],
-            diameter=THT_PAD_DIAMETER,
-            inner_diameter=THT_PAD_DRILL,
-            rotation=self.rotation,
-            rotation_origin=self.centre,
-        )
+        add_pads(footprint, SWITCH_PADS, self.centre, self.rotation)
+        add_outline(footprint, PLATE_CUTOUT, self.centre, self.rotation)
 
         self.__add_switch_courtyard(footprint)
 
         if self.led:
-            self.__add_led_holes(footprint)
+            add_pads(footprint, LED_PADS, self.centre, self.rotation)
 
     def __add_switch_courtyard(self, footprint: Footprint):
         footprint.append(
@@ -62,26 +65,3 @@ class AlpsKeyswitch(Keyswitch):
                 angle=self.rotation,
             )
         )
-
-    def __add_led_holes(self, footprint: Footprint):
-        common.add_tht_hole(
-            kicad_mod=footprint,
-            pad_pin=3,
-            centre=[-LED_SPACING + self.centre.x, 4.6],
-            diameter=LED_HOLE_DIAMETER,
-            inner_diameter=LED_HOLE_DRILL,
-            rotation=self.rotation,
-            rotation_origin=self.centre,
-            pad_shape=Pad.SHAPE_ROUNDRECT,
-        )
-
-        common.add_tht_hole(
-            kicad_mod=footprint,
-            pad_pin=4,
-            centre=[LED_SPACING + self.centre.x, 4.6],
-            diameter=LED_HOLE_DIAMETER,
-            inner_diameter=LED_HOLE_DRILL,
-            rotation=self.rotation,
-            rotation_origin=self.centre,
-            pad_shape=Pad.SHAPE_CIRCLE,
-        )
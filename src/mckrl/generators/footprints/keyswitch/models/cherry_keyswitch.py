@@ -1,7 +1,8 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from .keyswitch import Keyswitch
-from .. import common
+from ..plate import PLATE_LAYER
+from ..templates import PadTemplate, add_outline, add_pads, rectangle_outline
 from KicadModTree import Footprint, Vector2D, Pad
 
 THT_PAD_DIAMETER = 2.54
@@ -11,6 +12,55 @@ MOUNT_PIN_DIAMETER = 1.7525
 PIN_GRID = 1.27
 SWITCH_ACCESSORY_HOLE_DIAMETER = 1.905
 SWITCH_ACCESSORY_HOLE_DRILL = 1
+SWITCH_ACCESSORY_HOLE_Y = 5.08
+PLATE_CUTOUT_SIZE = 14
+
+SWITCH_PADS = (
+    # Solder pads
+    PadTemplate(-3.81, -2.54, THT_PAD_DIAMETER, THT_PAD_DRILL, number=1),
+    PadTemplate(2.54, -5.08, THT_PAD_DIAMETER, THT_PAD_DRILL, number=2),
+    # NPTHs
+    PadTemplate(0, 0, SWITCH_HOLE_DIAMETER, SWITCH_HOLE_DIAMETER),
+    PadTemplate(-5.08, 0, MOUNT_PIN_DIAMETER, MOUNT_PIN_DIAMETER),
+    PadTemplate(5.08, 0, MOUNT_PIN_DIAMETER, MOUNT_PIN_DIAMETER),
+)
+
+PLATE_CUTOUT = rectangle_outline(PLATE_LAYER, PLATE_CUTOUT_SIZE, PLATE_CUTOUT_SIZE)
+
+# LED & diode legs sit on a 1.27mm grid below the switch, LEDs on the inner pair
+LED_PADS = (
+    PadTemplate(
+        -PIN_GRID,
+        SWITCH_ACCESSORY_HOLE_Y,
+        SWITCH_ACCESSORY_HOLE_DIAMETER,
+        SWITCH_ACCESSORY_HOLE_DRILL,
+        number=3,
+        shape=Pad.SHAPE_ROUNDRECT,
+    ),
+    PadTemplate(
+        PIN_GRID,
+        SWITCH_ACCESSORY_HOLE_Y,
+        SWITCH_ACCESSORY_HOLE_DIAMETER,
+        SWITCH_ACCESSORY_HOLE_DRILL,
+        number=4,
+    ),
+)
+DIODE_PADS = (
+    PadTemplate(
+        -PIN_GRID * 3,
+        SWITCH_ACCESSORY_HOLE_Y,
+        SWITCH_ACCESSORY_HOLE_DIAMETER,
+        SWITCH_ACCESSORY_HOLE_DRILL,
+        number=3,
+    ),
+    PadTemplate(
+        PIN_GRID * 3,
+        SWITCH_ACCESSORY_HOLE_Y,
+        SWITCH_ACCESSORY_HOLE_DIAMETER,
+        SWITCH_ACCESSORY_HOLE_DRILL,
+        number=4,
+    ),
+)
 
 
 class CherryKeyswitch(Keyswitch):
@@ -29,78 +79,10 @@ class CherryKeyswitch(Keyswitch):
         self,
         footprint: Footprint,
     ):
-        # Create Solder pads for switch
-        common.add_tht_hole(
-            kicad_mod=footprint,
-            pad_pin=1,
-            centre=[-3.81 + self.centre.x, -2.54],
-            diameter=THT_PAD_DIAMETER,
-            inner_diameter=THT_PAD_DRILL,
-            rotation=self.rotation,
-            rotation_origin=self.centre,
-        )
-
-        common.add_tht_hole(
-            kicad_mod=footprint,
-            pad_pin=2,
-            centre=[2.54 + self.centre.x, -5.08],
-            diameter=THT_PAD_DIAMETER,
-            inner_diameter=THT_PAD_DRILL,
-            rotation=self.rotation,
-            rotation_origin=self.centre,
-        )
-
-        # Create NPTHs of switch
-        common.add_npth_hole(
-            kicad_mod=footprint,
-            centre=self.centre,
-            diameter=SWITCH_HOLE_DIAMETER,
-            rotation=self.rotation,
-            rotation_origin=self.centre,
-        )
-
-        common.add_npth_hole(
-            kicad_mod=footprint,
-            centre=[-5.08 + self.centre.x, self.centre.y],
-            diameter=MOUNT_PIN_DIAMETER,
-            rotation=self.rotation,
-            rotation_origin=self.centre,
-        )
-
-        common.add_npth_hole(
-            kicad_mod=footprint,
-            centre=[5.08 + self.centre.x, self.centre.y],
-            diameter=MOUNT_PIN_DIAMETER,
-            rotation=self.rotation,
-            rotation_origin=self.centre,
-        )
-
-        self.__add_switch_accessory_holes(footprint)
-
-    def __add_switch_accessory_holes(self, footprint: Footprint):
-        position_mapping = {
-            0: -PIN_GRID * 3,
-            1: -PIN_GRID,
-            2: PIN_GRID,
-            3: PIN_GRID * 3,
-        }
-
-        positions = []
-
-        if self.diode:
-            positions = [0, 3]
+        add_pads(footprint, SWITCH_PADS, self.centre, self.rotation)
+        add_outline(footprint, PLATE_CUTOUT, self.centre, self.rotation)
 
         if self.led:
-            positions = [1, 2]
-
-        for position in positions:
-            common.add_tht_hole(
-                kicad_mod=footprint,
-                pad_pin=3 if position == 0 or position == 1 else 4,
-                centre=[position_mapping[position] + self.centre.x, 5.08],
-                diameter=SWITCH_ACCESSORY_HOLE_DIAMETER,
-                inner_diameter=SWITCH_ACCESSORY_HOLE_DRILL,
-                rotation=self.rotation,
-                rotation_origin=self.centre,
-                pad_shape=Pad.SHAPE_ROUNDRECT if position == 1 else Pad.SHAPE_CIRCLE,
-            )
+            add_pads(footprint, LED_PADS, self.centre, self.rotation)
+        elif self.diode:
+            add_pads(footprint, DIODE_PADS, self.centre, self.rotation)
@@ -1,8 +1,16 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from .stabiliser import Stabiliser
-from .. import common
-from KicadModTree import Footprint, Vector2D, PolygonLine
+from ..plate import PLATE_LAYER
+from ..templates import (
+    OutlinePoint,
+    OutlineTemplate,
+    PadTemplate,
+    add_outline,
+    add_pads,
+    rectangle_outline,
+)
+from KicadModTree import Footprint, Vector2D
 
 STAB_BIG_HOLE_DIAMETER = 4
 STAB_SMALL_HOLE_DIAMETER = 3.05
@@ -21,6 +29,49 @@ STAB_VERTICAL_OFFSET = 1.25  # vertical centre is offset from switch position
 STAB_HEIGHT = 20
 STAB_WIDTH = 7
 STAB_WIRE_BUFFER = 4  # add room for the stabiliser wire
+STAB_PLATE_CUTOUT_WIDTH = 6.65
+STAB_PLATE_CUTOUT_HEIGHT = 12.3
+STAB_PLATE_CUTOUT_OFFSET = 0.6  # housings sit slightly below the switch centre
+
+# Housings sit either side of the switch, one half width away from its centre
+STABILISER_PADS = tuple(
+    PadTemplate(0, y, diameter, diameter, x_half_widths=side)
+    for side in (-1, 1)
+    for y, diameter in ((-7, STAB_SMALL_HOLE_DIAMETER), (8.24, STAB_BIG_HOLE_DIAMETER))
+)
+
+_COURTYARD_TOP = STAB_VERTICAL_OFFSET - (STAB_HEIGHT / 2)
+_COURTYARD_BOTTOM = STAB_VERTICAL_OFFSET + (STAB_HEIGHT / 2)
+STABILISER_COURTYARD = OutlineTemplate(
+    layer="F.CrtYd",
+    points=(
+        OutlinePoint(-(STAB_WIDTH / 2), _COURTYARD_TOP, x_half_widths=-1),
+        OutlinePoint(STAB_WIDTH / 2, _COURTYARD_TOP, x_half_widths=-1),
+        OutlinePoint(
+            STAB_WIDTH / 2, _COURTYARD_BOTTOM - STAB_WIRE_BUFFER, x_half_widths=-1
+        ),
+        OutlinePoint(
+            -(STAB_WIDTH / 2), _COURTYARD_BOTTOM - STAB_WIRE_BUFFER, x_half_widths=1
+        ),
+        OutlinePoint(-(STAB_WIDTH / 2), _COURTYARD_TOP, x_half_widths=1),
+        OutlinePoint(STAB_WIDTH / 2, _COURTYARD_TOP, x_half_widths=1),
+        OutlinePoint(STAB_WIDTH / 2, _COURTYARD_BOTTOM, x_half_widths=1),
+        OutlinePoint(-(STAB_WIDTH / 2), _COURTYARD_BOTTOM, x_half_widths=-1),
+        OutlinePoint(-(STAB_WIDTH / 2), _COURTYARD_TOP, x_half_widths=-1),
+    ),
+)
+
+# One plate-mount housing cutout either side of the switch
+STABILISER_PLATE_CUTOUTS = tuple(
+    rectangle_outline(
+        PLATE_LAYER,
+        STAB_PLATE_CUTOUT_WIDTH,
+        STAB_PLATE_CUTOUT_HEIGHT,
+        y=STAB_PLATE_CUTOUT_OFFSET,
+        x_half_widths=side,
+    )
+    for side in (-1, 1)
+)
 
 
 class CherryStabiliser(Stabiliser):
@@ -28,9 +79,11 @@ class CherryStabiliser(Stabiliser):
         self,
         width_u: float,
         rotation: float,
-        centre: Vector2D = Vector2D(0, 0),
+        centre: Vector2D | None = None,
     ):
-        super().__init__(width_u, rotation, centre)
+        super().__init__(
+            width_u, rotation, centre if centre is not None else Vector2D(0, 0)
+        )
 
         width = CHERRY_STABILISER_WIDTH.get(self.width_u)
 
@@ -40,93 +93,25 @@ class CherryStabiliser(Stabiliser):
         self.__stabiliser_centre_distance = width / 2
 
     def add_stabiliser_footprint(self, footprint: Footprint):
-        common.add_npth_hole(
-            kicad_mod=footprint,
-            centre=Vector2D(
-                self.centre.x - self.__stabiliser_centre_distance,
-                self.centre.y - 7,
-            ),
-            diameter=STAB_SMALL_HOLE_DIAMETER,
-            rotation=self.rotation,
-            rotation_origin=self.centre,
-        )
-
-        common.add_npth_hole(
-            kicad_mod=footprint,
-            centre=Vector2D(
-                self.centre.x - self.__stabiliser_centre_distance,
-                self.centre.y + 8.24,
-            ),
-            diameter=STAB_BIG_HOLE_DIAMETER,
-            rotation=self.rotation,
-            rotation_origin=self.centre,
+        add_pads(
+            footprint,
+            STABILISER_PADS,
+            self.centre,
+            self.rotation,
+            self.__stabiliser_centre_distance,
         )
-
-        common.add_npth_hole(
-            kicad_mod=footprint,
-            centre=Vector2D(
-                self.centre.x + self.__stabiliser_centre_distance,
-                self.centre.y - 7,
-            ),
-            diameter=STAB_SMALL_HOLE_DIAMETER,
-            rotation=self.rotation,
-            rotation_origin=self.centre,
-        )
-
-        common.add_npth_hole(
-            kicad_mod=footprint,
-            centre=Vector2D(
-                self.centre.x + self.__stabiliser_centre_distance,
-                self.centre.y + 8.24,
-            ),
-            diameter=STAB_BIG_HOLE_DIAMETER,
-            rotation=self.rotation,
-            rotation_origin=self.centre,
-        )
-
-        self.__add_stabiliser_courtyard(footprint, self.__stabiliser_centre_distance)
-
-    def __add_stabiliser_courtyard(self, footprint: Footprint, half_width: float):
-        centre_y = self.centre.y + STAB_VERTICAL_OFFSET
-        line = PolygonLine(
-            shape=[
-                [
-                    self.centre.x - half_width - (STAB_WIDTH / 2),
-                    centre_y - (STAB_HEIGHT / 2),
-                ],
-                [
-                    self.centre.x - half_width + (STAB_WIDTH / 2),
-                    centre_y - (STAB_HEIGHT / 2),
-                ],
-                [
-                    self.centre.x - half_width + (STAB_WIDTH / 2),
-                    (centre_y + (STAB_HEIGHT / 2)) - STAB_WIRE_BUFFER,
-                ],
-                [
-                    self.centre.x + half_width - (STAB_WIDTH / 2),
-                    (centre_y + (STAB_HEIGHT / 2)) - STAB_WIRE_BUFFER,
-                ],
-                [
-                    self.centre.x + half_width - (STAB_WIDTH / 2),
-                    centre_y - (STAB_HEIGHT / 2),
-                ],
-                [
-                    self.centre.x + half_width + (STAB_WIDTH / 2),
-                    centre_y - (STAB_HEIGHT / 2),
-                ],
-                [
-                    self.centre.x + half_width + (STAB_WIDTH / 2),
-                    centre_y + (STAB_HEIGHT / 2),
-                ],
-                [
-                    self.centre.x - half_width - (STAB_WIDTH / 2),
-                    centre_y + (STAB_HEIGHT / 2),
-                ],
-                [
-                    self.centre.x - half_width - (STAB_WIDTH / 2),
-                    centre_y - (STAB_HEIGHT / 2),
-                ],
-            ],
-            layer="F.CrtYd",
+        add_outline(
+            footprint,
+            STABILISER_COURTYARD,
+            self.centre,
+            self.rotation,
+            self.__stabiliser_centre_distance,
         )
-        footprint.append(line.rotate(origin=self.centre, angle=self.rotation))
+        for cutout in STABILISER_PLATE_CUTOUTS:
+            add_outline(
+                footprint,
+                cutout,
+                self.centre,
+                self.rotation,
+                self.__stabiliser_centre_distance,
+            )
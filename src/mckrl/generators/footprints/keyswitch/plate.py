@@ -0,0 +1,7 @@
+# SPDX-License-Identifier: Apache-2.0
+
+from typing import Final
+
+# Switch & stabiliser plate cutouts are drawn on this layer of every generated
+# footprint, kept free of KicadModTree so the svg & dxf targets can read it too
+PLATE_LAYER: Final[str] = "User.1"
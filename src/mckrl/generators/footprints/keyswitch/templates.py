@@ -0,0 +1,105 @@
+# SPDX-License-Identifier: Apache-2.0
+
+from dataclasses import dataclass
+from KicadModTree import Footprint, Pad, PolygonLine, Vector2D
+
+from . import common
+
+
+@dataclass(frozen=True, slots=True)
+class PadTemplate:
+    """
+    A pad relative to the centre of a model, `x_half_widths` moves it by a
+    multiple of the half width given when emitting (e.g. stabiliser wire ends).
+    Pads without a number are NPTHs.
+    """
+
+    x: float
+    y: float
+    diameter: float
+    drill: float
+    number: int | None = None
+    shape: str = Pad.SHAPE_CIRCLE
+    x_half_widths: float = 0
+
+
+@dataclass(frozen=True, slots=True)
+class OutlinePoint:
+    x: float
+    y: float
+    x_half_widths: float = 0
+
+
+@dataclass(frozen=True, slots=True)
+class OutlineTemplate:
+    layer: str
+    points: tuple[OutlinePoint, ...]
+
+
+def rectangle_outline(
+    layer: str,
+    width: float,
+    height: float,
+    y: float = 0,
+    x_half_widths: float = 0,
+) -> OutlineTemplate:
+    corners = ((-1, -1), (1, -1), (1, 1), (-1, 1), (-1, -1))
+    return OutlineTemplate(
+        layer=layer,
+        points=tuple(
+            OutlinePoint(x * width / 2, y + y_side * height / 2, x_half_widths)
+            for x, y_side in corners
+        ),
+    )
+
+
+def add_pads(
+    footprint: Footprint,
+    pads: tuple[PadTemplate, ...],
+    centre: Vector2D,
+    rotation: float,
+    half_width: float = 0,
+):
+    for pad in pads:
+        pad_centre = Vector2D(
+            centre.x + pad.x_half_widths * half_width + pad.x, centre.y + pad.y
+        )
+        if pad.number is None:
+            common.add_npth_hole(
+                kicad_mod=footprint,
+                centre=pad_centre,
+                diameter=pad.diameter,
+                rotation=rotation,
+                rotation_origin=centre,
+            )
+        else:
+            common.add_tht_hole(
+                kicad_mod=footprint,
+                pad_pin=pad.number,
+                centre=pad_centre,
+                diameter=pad.diameter,
+                inner_diameter=pad.drill,
+                rotation=rotation,
+                rotation_origin=centre,
+                pad_shape=pad.shape,
+            )
+
+
+def add_outline(
+    footprint: Footprint,
+    outline: OutlineTemplate,
+    centre: Vector2D,
+    rotation: float,
+    half_width: float = 0,
+):
+    line = PolygonLine(
+        shape=[
+            [
+                centre.x + point.x_half_widths * half_width + point.x,
+                centre.y + point.y,
+            ]
+            for point in outline.points
+        ],
+        layer=outline.layer,
+    )
+    footprint.append(line.rotate(origin=centre, angle=rotation))
@@ -0,0 +1,213 @@
+# SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Final, Iterator
+
+KICAD_MOD_SUFFIX: Final[str] = ".kicad_mod"
+
+# Shared with the mirroring code so both read s-expressions the same way
+TOKEN_PATTERN = re.compile(r'\(|\)|"(?:[^"\\]|\\.)*"|[^\s()"]+')
+# uuid nodes (tstamp in older files) along with the whitespace leading up to them
+UUID_PATTERN = re.compile(r'\s*\(\s*(?:uuid|tstamp)\s+"?[0-9a-fA-F-]+"?\s*\)')
+
+
+# Geometry is read back from the written `.kicad_mod` files rather than from
+# KicadModTree objects, this keeps the post-generation stages (checks, previews,
+# diffs) working on constant footprints and older libraries too.
+@dataclass(slots=True)
+class PadGeometry:
+    number: str
+    type: str
+    shape: str
+    x: float
+    y: float
+    rotation: float
+    width: float
+    height: float
+    drill: float | None
+    layers: tuple[str, ...]
+
+    @property
+    def is_plated(self) -> bool:
+        return self.type == "thru_hole"
+
+    @property
+    def is_npth(self) -> bool:
+        return self.type == "np_thru_hole"
+
+    @property
+    def label(self) -> str:
+        # Unnumbered pads are NPTHs, told apart by where they are
+        if self.number != "":
+            return f"pad {self.number}"
+        return f"hole at ({self.x:g}, {self.y:g})"
+
+
+@dataclass(slots=True)
+class LineGeometry:
+    layer: str
+    start: tuple[float, float]
+    end: tuple[float, float]
+
+
+@dataclass(slots=True)
+class FootprintGeometry:
+    name: str
+    path: Path | None = None
+    description: str = ""
+    tags: str = ""
+    properties: dict[str, str] = field(default_factory=dict)
+    pads: list[PadGeometry] = field(default_factory=list)
+    lines: list[LineGeometry] = field(default_factory=list)
+
+    def lines_on_layer(self, layer: str) -> list[LineGeometry]:
+        return [line for line in self.lines if line.layer == layer]
+
+
+def _unquote(token: str) -> str:
+    if token.startswith('"'):
+        return token[1:-1].replace('\\"', '"').replace("\\\\", "\\")
+    return token
+
+
+def parse_sexpr(text: str) -> list:
+    stack: list[list] = [[]]
+    for token in TOKEN_PATTERN.findall(text):
+        if token == "(":
+            stack.append([])
+        elif token == ")":
+            if len(stack) == 1:
+                raise ValueError("Unbalanced ')' in s-expression")
+            node = stack.pop()
+            stack[-1].append(node)
+        else:
+            stack[-1].append(_unquote(token))
+
+    if len(stack) != 1 or len(stack[0]) != 1:
+        raise ValueError("Expected exactly one top level s-expression")
+
+    return stack[0][0]
+
+
+def _children(node: list, name: str) -> Iterator[list]:
+    for child in node[1:]:
+        if isinstance(child, list) and len(child) > 0 and child[0] == name:
+            yield child
+
+
+def _child(node: list, name: str) -> list | None:
+    return next(_children(node, name), None)
+
+
+def _point(node: list | None) -> tuple[float, float]:
+    if node is None:
+        return (0.0, 0.0)
+    return (float(node[1]), float(node[2]))
+
+
+def _parse_drill(node: list | None) -> float | None:
+    if node is None:
+        return None
+    # Oval drills are written as `(drill oval w h)`, the narrowest axis is what
+    # matters for annular ring & clearance purposes
+    sizes = [
+        float(value) for value in node[1:] if isinstance(value, str) and value != "oval"
+    ]
+    if len(sizes) == 0:
+        return None
+    return min(sizes)
+
+
+def _parse_pad(node: list) -> PadGeometry:
+    at = _child(node, "at")
+    size = _child(node, "size")
+    layers = _child(node, "layers")
+    x, y = _point(at)
+    width, height = _point(size)
+
+    return PadGeometry(
+        number=node[1],
+        type=node[2],
+        shape=node[3],
+        x=x,
+        y=y,
+        rotation=float(at[3]) if at is not None and len(at) > 3 else 0.0,
+        width=width,
+        height=height,
+        drill=_parse_drill(_child(node, "drill")),
+        layers=tuple(layers[1:]) if layers is not None else (),
+    )
+
+
+def _parse_lines(node: list) -> list[LineGeometry]:
+    layer_node = _child(node, "layer")
+    layer = layer_node[1] if layer_node is not None else ""
+
+    if node[0] == "fp_line":
+        return [
+            LineGeometry(
+                layer=layer,
+                start=_point(_child(node, "start")),
+                end=_point(_child(node, "end")),
+            )
+        ]
+
+    if node[0] == "fp_rect":
+        (x1, y1), (x2, y2) = _point(_child(node, "start")), _point(_child(node, "end"))
+        corners = [(x1, y1), (x2, y1), (x2, y2), (x1, y2)]
+    elif node[0] == "fp_poly":
+        pts = _child(node, "pts")
+        corners = [_point(xy) for xy in _children(pts, "xy")] if pts else []
+    else:
+        return []
+
+    return [
+        LineGeometry(layer=layer, start=start, end=end)
+        for start, end in zip(corners, corners[1:] + corners[:1])
+    ]
+
+
+def footprint_from_sexpr(tree: list, path: Path | None = None) -> FootprintGeometry:
+    if len(tree) < 2 or tree[0] not in ("footprint", "module"):
+        raise ValueError(f"Not a KiCad footprint: {path}")
+
+    footprint = FootprintGeometry(name=tree[1], path=path)
+
+    for child in tree[2:]:
+        if not isinstance(child, list) or len(child) == 0:
+            continue
+        match child[0]:
+            case "descr":
+                footprint.description = child[1]
+            case "tags":
+                footprint.tags = child[1]
+            case "property":
+                footprint.properties[child[1]] = child[2]
+            case "pad":
+                footprint.pads.append(_parse_pad(child))
+            case "fp_line" | "fp_rect" | "fp_poly":
+                footprint.lines.extend(_parse_lines(child))
+
+    return footprint
+
+
+def parse_footprint(text: str, path: Path | None = None) -> FootprintGeometry:
+    return footprint_from_sexpr(parse_sexpr(text), path)
+
+
+def read_footprint(path: Path) -> FootprintGeometry:
+    return parse_footprint(path.read_text(), path)
+
+
+def content_hash(text: str) -> str:
+    # UUIDs are regenerated on every write and carry no geometry, leaving them
+    # out means an unchanged footprint always hashes the same
+    normalised = UUID_PATTERN.sub("", text)
+    return hashlib.sha256(normalised.encode()).hexdigest()
+
+
+def find_footprint_files(library_directory: Path) -> list[Path]:
+    return sorted(library_directory.rglob(f"*{KICAD_MOD_SUFFIX}"))
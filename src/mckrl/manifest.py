@@ -0,0 +1,59 @@
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Final
+
+from mckrl.kicad_mod import content_hash, find_footprint_files
+
+# Not dot-prefixed so it ships in the release archive & can be diffed against
+MANIFEST_FILE_NAME: Final[str] = "mckrl-manifest.json"
+# Bump whenever content hashes change, older manifests are then re-hashed
+MANIFEST_VERSION: Final[int] = 2
+
+
+def _hash_file(path: Path) -> str:
+    return content_hash(path.read_text())
+
+
+def build_manifest(
+    library_directory: Path, footprint_paths: list[Path] | None = None
+) -> dict[str, str]:
+    """
+    Maps the library relative path of every footprint to its content hash.
+    """
+    if footprint_paths is None:
+        footprint_paths = find_footprint_files(library_directory)
+
+    with ThreadPoolExecutor() as executor:
+        hashes = list(executor.map(_hash_file, footprint_paths))
+
+    return {
+        path.relative_to(library_directory).as_posix(): footprint_hash
+        for path, footprint_hash in zip(footprint_paths, hashes)
+    }
+
+
+def write_manifest(library_directory: Path) -> dict[str, str]:
+    footprints = build_manifest(library_directory)
+    (library_directory / MANIFEST_FILE_NAME).write_text(
+        json.dumps(
+            {"version": MANIFEST_VERSION, "footprints": footprints},
+            indent=2,
+            sort_keys=True,
+        )
+    )
+    return footprints
+
+
+def read_manifest(library_directory: Path) -> dict[str, str] | None:
+    manifest_path = library_directory / MANIFEST_FILE_NAME
+    if not manifest_path.exists():
+        return None
+
+    manifest = json.loads(manifest_path.read_text())
+    if manifest.get("version") != MANIFEST_VERSION:
+        return None
+
+    return manifest["footprints"]
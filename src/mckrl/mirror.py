@@ -0,0 +1,232 @@
+# SPDX-License-Identifier: Apache-2.0
+
+import math
+import re
+from typing import Final
+
+from mckrl.check import TOLERANCE_MM
+from mckrl.kicad_mod import TOKEN_PATTERN, UUID_PATTERN, PadGeometry, parse_footprint
+
+_FOOTPRINT_NAME_PATTERN = re.compile(r'^(\s*\(\s*(?:footprint|module)\s+)("[^"]*"|\S+)')
+_EMPTY_JUSTIFY_PATTERN = re.compile(r"\s*\(\s*justify\s*\)")
+
+# Nodes whose first argument is an X coordinate
+X_COORDINATE_NODES: Final[set[str]] = {
+    "at",
+    "start",
+    "end",
+    "mid",
+    "center",
+    "xy",
+    "offset",
+}
+LAYER_NODES: Final[set[str]] = {"layer", "layers"}
+TEXT_NODES: Final[set[str]] = {"property", "fp_text"}
+# Graphics copied onto the back of a reversible footprint
+GRAPHIC_NODES: Final[set[str]] = {
+    "fp_line",
+    "fp_rect",
+    "fp_poly",
+    "fp_circle",
+    "fp_arc",
+}
+
+
+def _negate(number: str) -> str:
+    if float(number) == 0:
+        return number
+    return number[1:] if number.startswith("-") else f"-{number}"
+
+
+def _mirror_angle(angle: str) -> str:
+    return f"{-float(angle) % 360:g}"
+
+
+def _swap_layer(token: str) -> str:
+    quoted = token.startswith('"')
+    layer = token[1:-1] if quoted else token
+    if layer.startswith("F."):
+        layer = "B." + layer[2:]
+    elif layer.startswith("B."):
+        layer = "F." + layer[2:]
+    return f'"{layer}"' if quoted else layer
+
+
+def mirror_kicad_mod(text: str) -> str:
+    """
+    Mirrors a serialised footprint around the Y axis & swaps front/back layers in
+    a single pass over its tokens, all formatting outside the rewritten tokens is
+    kept as is. Text moved onto a back layer is marked as mirrored.
+    """
+    output = []
+    position = 0
+    # Each open node tracks [head, argument count, flag], the flag records whether
+    # an effects node contains a justify node or a justify node contains mirror
+    stack: list[list] = []
+    back_text_nodes: set[int] = set()
+
+    def in_back_text() -> bool:
+        return any(
+            stack[i][0] in TEXT_NODES and i in back_text_nodes
+            for i in range(len(stack))
+        )
+
+    for match in TOKEN_PATTERN.finditer(text):
+        token = match.group()
+        replacement = token
+        # Inserted before the whitespace leading up to token, keeps closing
+        # parentheses on their own lines
+        insertion = ""
+
+        if token == "(":
+            stack.append([None, 0, False])
+        elif token == ")":
+            head, _, flag = stack.pop()
+            if head == "justify":
+                if len(stack) > 0:
+                    stack[-1][2] = True
+                if in_back_text() and not flag:
+                    insertion = " mirror"
+            elif head == "effects" and not flag and in_back_text():
+                insertion = " (justify mirror)"
+            if head in TEXT_NODES:
+                back_text_nodes.discard(len(stack))
+        elif len(stack) > 0 and stack[-1][0] is None:
+            stack[-1][0] = token
+        elif len(stack) > 0:
+            node = stack[-1]
+            node[1] += 1
+            head, argument = node[0], node[1]
+            if head in X_COORDINATE_NODES and argument == 1:
+                replacement = _negate(token)
+            elif head == "at" and argument == 3:
+                replacement = _mirror_angle(token)
+            elif head in LAYER_NODES:
+                replacement = _swap_layer(token)
+                is_back = replacement.strip('"').startswith("B.")
+                if is_back and len(stack) > 1 and stack[-2][0] in TEXT_NODES:
+                    back_text_nodes.add(len(stack) - 2)
+            elif head == "justify" and token == "mirror":
+                node[2] = True
+                # Text that was already mirrored is moving to the front
+                if not in_back_text():
+                    replacement = ""
+
+        output.append(insertion)
+        output.append(text[position : match.start()])
+        output.append(replacement)
+        position = match.end()
+
+    output.append(text[position:])
+    # Text that only carried a mirror justification is left with an empty node
+    return _EMPTY_JUSTIFY_PATTERN.sub("", "".join(output))
+
+
+def rename_kicad_mod(text: str, suffix: str) -> str:
+    match = _FOOTPRINT_NAME_PATTERN.match(text)
+    if match is None:
+        raise ValueError("Not a KiCad footprint")
+
+    quoted_name = match.group(2)
+    name = quoted_name.strip('"')
+    renamed = f'"{name}{suffix}"'
+
+    text = text[: match.start(2)] + renamed + text[match.end(2) :]
+    return text.replace(
+        f'(property "Value" {quoted_name}', f'(property "Value" {renamed}'
+    )
+
+
+def _top_level_nodes(text: str) -> list[tuple[str, int, int]]:
+    nodes = []
+    depth = 0
+    start = 0
+    head = None
+    for match in TOKEN_PATTERN.finditer(text):
+        token = match.group()
+        if token == "(":
+            depth += 1
+            if depth == 2:
+                start, head = match.start(), None
+        elif token == ")":
+            if depth == 2:
+                nodes.append((head or "", start, match.end()))
+            depth -= 1
+        elif depth == 2 and head is None:
+            head = token
+    return nodes
+
+
+class ReversibleOverlapError(ValueError):
+    pass
+
+
+def _pad_key(pad: PadGeometry) -> tuple:
+    # Pads are the same hole/copper when they share a position & size, whatever
+    # their number
+    return tuple(
+        round(value, 6) if value is not None else None
+        for value in (pad.x, pad.y, pad.width, pad.height, pad.drill)
+    )
+
+
+def _copper_overlaps(a: PadGeometry, b: PadGeometry) -> bool:
+    # Pads are treated as circles circumscribing their copper, the same
+    # conservative approximation the design-rule checks use
+    distance = math.hypot(a.x - b.x, a.y - b.y)
+    reach = (max(a.width, a.height) + max(b.width, b.height)) / 2
+    return distance < reach - TOLERANCE_MM
+
+
+def reversible_kicad_mod(text: str, back_text: str | None = None) -> str:
+    """
+    Adds the mirrored pads & back layer graphics to the front footprint, pads that
+    land exactly on an existing front pad (e.g. symmetric NPTHs) are not repeated.
+
+    Raises ReversibleOverlapError when a mirrored copper pad would touch a front
+    pad with a different number, writing it out would short the two nets.
+    """
+    if back_text is None:
+        back_text = mirror_kicad_mod(text)
+
+    front_pads = parse_footprint(text).pads
+    front_keys = {_pad_key(pad) for pad in front_pads}
+    additions = []
+
+    for head, start, end in _top_level_nodes(back_text):
+        node = back_text[start:end]
+        if head == "pad":
+            pad = parse_footprint(f"(footprint x {node})").pads[0]
+            if not pad.is_npth:
+                shorted = [
+                    front_pad
+                    for front_pad in front_pads
+                    if not front_pad.is_npth
+                    and front_pad.number != pad.number
+                    and _copper_overlaps(pad, front_pad)
+                ]
+                if len(shorted) > 0:
+                    raise ReversibleOverlapError(
+                        f"Mirrored pad {pad.number} at ({pad.x:g}, {pad.y:g}) "
+                        f"overlaps front pad {shorted[0].number} at "
+                        f"({shorted[0].x:g}, {shorted[0].y:g}), a reversible "
+                        "footprint would short them"
+                    )
+            if _pad_key(pad) in front_keys:
+                continue
+        elif head in GRAPHIC_NODES:
+            layer = re.search(r'\(layer\s+"?([^")\s]+)', node)
+            if layer is None or not layer.group(1).startswith("B."):
+                continue
+        else:
+            continue
+        additions.append(UUID_PATTERN.sub("", node))
+
+    closing = text.rstrip().rindex(")")
+    indent = "\n\t"
+    return (
+        text[:closing].rstrip()
+        + "".join(indent + addition for addition in additions)
+        + "\n"
+        + text[closing:]
+    )
@@ -1,16 +1,21 @@
 import inspect
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Final
 
 import pydantic
 from pydantic import ConfigDict
 
+# Parameters supplied by the CLI rather than definition files
+INJECTED_PARAMETERS: Final[set[str]] = {"output_dir", "targets"}
+
 
 def create_validation_model(generate_func: Callable) -> type[pydantic.BaseModel]:
     params = inspect.getfullargspec(generate_func)
 
     annotations = {
-        key: val for key, val in params.annotations.items() if key != "output_dir"
+        key: val
+        for key, val in params.annotations.items()
+        if key not in INJECTED_PARAMETERS
     }
     params_model = pydantic.create_model(
         "GenerateParams",
@@ -20,6 +25,8 @@ def create_validation_model(generate_func: Callable) -> type[pydantic.BaseModel]
     combinations_model = pydantic.create_model(
         "GenerateCombinations",
         **{key: (list[t] | None, None) for key, t in annotations.items()},  # type: ignore
+        exclude=(list[str] | None, None),
+        require=(list[str] | None, None),
         __config__=ConfigDict(extra="forbid"),
     )
 
@@ -0,0 +1,201 @@
+# SPDX-License-Identifier: Apache-2.0
+
+import html
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Final, NamedTuple
+
+from mckrl.kicad_mod import (
+    FootprintGeometry,
+    PadGeometry,
+    content_hash,
+    find_footprint_files,
+    parse_footprint,
+)
+
+# Bump whenever the rendered output changes so stale cache entries are ignored
+RENDERER_VERSION: Final[str] = "1"
+
+PREVIEW_MARGIN_MM: Final[float] = 1
+CONTACT_SHEET_NAME: Final[str] = "index.html"
+BATCH_SIZE: Final[int] = 64
+
+COPPER_COLOUR: Final[str] = "#c83434"
+HOLE_COLOUR: Final[str] = "#1b1b1b"
+LINE_STYLES: Final[dict[str, str]] = {
+    "Dwgs.User": 'stroke="#8a8a8a" stroke-width="0.15" stroke-dasharray="0.6 0.4"',
+    "F.CrtYd": 'stroke="#d43ad4" stroke-width="0.05"',
+}
+
+
+class RenderedPreview(NamedTuple):
+    footprint_path: Path
+    cache_path: Path
+    cache_hit: bool
+
+
+def _render_pad(pad: PadGeometry) -> list[str]:
+    elements = []
+
+    if not pad.is_npth:
+        width, height = pad.width, pad.height
+        transform = f'transform="rotate({-pad.rotation:g} {pad.x:g} {pad.y:g})"'
+        if pad.shape == "circle":
+            elements.append(
+                f'<circle cx="{pad.x:g}" cy="{pad.y:g}" r="{width / 2:g}" '
+                f'fill="{COPPER_COLOUR}"/>'
+            )
+        else:
+            corner_radius = {"rect": 0, "roundrect": 0.25 * min(width, height)}.get(
+                pad.shape, min(width, height) / 2
+            )
+            elements.append(
+                f'<rect x="{pad.x - width / 2:g}" y="{pad.y - height / 2:g}" '
+                f'width="{width:g}" height="{height:g}" rx="{corner_radius:g}" '
+                f'fill="{COPPER_COLOUR}" {transform}/>'
+            )
+
+    if pad.drill is not None:
+        elements.append(
+            f'<circle cx="{pad.x:g}" cy="{pad.y:g}" r="{pad.drill / 2:g}" '
+            f'fill="{HOLE_COLOUR}"/>'
+        )
+
+    return elements
+
+
+def _bounds(footprint: FootprintGeometry) -> tuple[float, float, float, float]:
+    xs, ys = [0.0], [0.0]
+    for pad in footprint.pads:
+        radius = max(pad.width, pad.height) / 2
+        xs += [pad.x - radius, pad.x + radius]
+        ys += [pad.y - radius, pad.y + radius]
+    for line in footprint.lines:
+        if line.layer in LINE_STYLES:
+            xs += [line.start[0], line.end[0]]
+            ys += [line.start[1], line.end[1]]
+
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def render_svg(footprint: FootprintGeometry) -> str:
+    min_x, min_y, max_x, max_y = _bounds(footprint)
+    view_box = (
+        f"{min_x - PREVIEW_MARGIN_MM:g} {min_y - PREVIEW_MARGIN_MM:g} "
+        f"{max_x - min_x + 2 * PREVIEW_MARGIN_MM:g} "
+        f"{max_y - min_y + 2 * PREVIEW_MARGIN_MM:g}"
+    )
+
+    elements = [
+        f'<line x1="{line.start[0]:g}" y1="{line.start[1]:g}" '
+        f'x2="{line.end[0]:g}" y2="{line.end[1]:g}" {LINE_STYLES[line.layer]}/>'
+        for line in footprint.lines
+        if line.layer in LINE_STYLES
+    ]
+    for pad in footprint.pads:
+        elements += _render_pad(pad)
+
+    return "\n".join(
+        [
+            f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="{view_box}" '
+            'width="100%" fill="none" stroke-linecap="round">',
+            f"<title>{html.escape(footprint.name)}</title>",
+            *elements,
+            "</svg>",
+            "",
+        ]
+    )
+
+
+def render_contact_sheet(title: str, preview_file_names: dict[str, str]) -> str:
+    figures = [
+        f'<figure><img src="{html.escape(file_name)}" alt="{html.escape(name)}">'
+        f"<figcaption>{html.escape(name)}</figcaption></figure>"
+        for name, file_name in sorted(preview_file_names.items())
+    ]
+
+    return "\n".join(
+        [
+            "<!DOCTYPE html>",
+            f"<html><head><meta charset='utf-8'><title>{html.escape(title)}</title>",
+            "<style>",
+            "body { font-family: sans-serif; background: #f4f4f4; }",
+            "main { display: grid; gap: 1em;",
+            "  grid-template-columns: repeat(auto-fill, minmax(14em, 1fr)); }",
+            "figure { margin: 0; padding: 0.5em; background: white; }",
+            "figcaption { font-size: 0.75em; word-break: break-all; }",
+            "</style></head><body>",
+            f"<h1>{html.escape(title)}</h1>",
+            "<main>",
+            *figures,
+            "</main></body></html>",
+            "",
+        ]
+    )
+
+
+def _write_atomically(path: Path, content: str):
+    temporary_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    temporary_path.write_text(content)
+    os.replace(temporary_path, path)
+
+
+def render_cached_preview(
+    footprint_path: Path, cache_directory: Path
+) -> RenderedPreview:
+    text = footprint_path.read_text()
+    cache_path = cache_directory / f"{content_hash(RENDERER_VERSION + text)}.svg"
+
+    cache_hit = cache_path.exists()
+    if not cache_hit:
+        footprint = parse_footprint(text, footprint_path)
+        _write_atomically(cache_path, render_svg(footprint))
+
+    return RenderedPreview(footprint_path, cache_path, cache_hit)
+
+
+def _render_batch(batch: list[Path], cache_directory: Path) -> list[RenderedPreview]:
+    return [
+        render_cached_preview(footprint_path, cache_directory)
+        for footprint_path in batch
+    ]
+
+
+def render_library_previews(
+    library_directory: Path,
+    preview_directory: Path,
+    cache_directory: Path,
+    jobs: int | None = None,
+) -> list[RenderedPreview]:
+    cache_directory.mkdir(parents=True, exist_ok=True)
+    footprint_paths = find_footprint_files(library_directory)
+    batches = [
+        footprint_paths[i : i + BATCH_SIZE]
+        for i in range(0, len(footprint_paths), BATCH_SIZE)
+    ]
+
+    previews: list[RenderedPreview] = []
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for batch_previews in executor.map(
+            _render_batch, batches, [cache_directory] * len(batches)
+        ):
+            previews += batch_previews
+
+    sheets: dict[Path, dict[str, str]] = {}
+    for rendered in previews:
+        relative_path = rendered.footprint_path.relative_to(library_directory)
+        preview_path = (preview_directory / relative_path).with_suffix(".svg")
+        preview_path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(rendered.cache_path, preview_path)
+        sheets.setdefault(preview_path.parent, {})[preview_path.stem] = (
+            preview_path.name
+        )
+
+    for sheet_directory, preview_file_names in sheets.items():
+        (sheet_directory / CONTACT_SHEET_NAME).write_text(
+            render_contact_sheet(sheet_directory.name, preview_file_names)
+        )
+
+    return previews
@@ -0,0 +1,158 @@
+# SPDX-License-Identifier: Apache-2.0
+
+import ast
+import operator
+import re
+from typing import Any, Final
+
+RULE_KEYS: Final[tuple[str, ...]] = ("exclude", "require")
+
+# Measurements such as "2.25u" or "19.05mm" are compared by their number, rules
+# comparing measurements should only compare values given in the same unit
+MEASUREMENT_PATTERN: Final = re.compile(r"^[-+]?(\d+\.?\d*|\.\d+)[a-zA-Z]*$")
+
+NAMED_CONSTANTS: Final[dict[str, Any]] = {
+    "true": True,
+    "false": False,
+    "null": None,
+    "True": True,
+    "False": False,
+    "None": None,
+}
+
+COMPARISON_OPERATORS: Final[dict[type, Any]] = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.In: lambda a, b: a in b,
+    ast.NotIn: lambda a, b: a not in b,
+}
+
+
+def _comparable(value: Any) -> Any:
+    if isinstance(value, str) and MEASUREMENT_PATTERN.match(value):
+        return float(re.sub(r"[a-zA-Z]+$", "", value))
+    return value
+
+
+class Rule:
+    """
+    A boolean expression over definition parameters, e.g. `led and diode` or
+    `stabiliser_size > width`. Only names, constants, `and`/`or`/`not` and
+    comparisons are allowed.
+    """
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        try:
+            self.__tree = ast.parse(expression, mode="eval").body
+            self.names = frozenset(self.__collect_names(self.__tree))
+        except (SyntaxError, ValueError) as e:
+            raise ValueError(f"Invalid rule '{expression}': {e}") from e
+
+    def __collect_names(self, node: ast.AST) -> set[str]:
+        match node:
+            case ast.Name(id=name):
+                return set() if name in NAMED_CONSTANTS else {name}
+            case ast.Constant():
+                return set()
+            case ast.BoolOp(values=values):
+                return set().union(*map(self.__collect_names, values))
+            case ast.UnaryOp(op=ast.Not() | ast.USub(), operand=operand):
+                return self.__collect_names(operand)
+            case ast.Compare(left=left, ops=ops, comparators=comparators):
+                if not all(type(op) in COMPARISON_OPERATORS for op in ops):
+                    raise ValueError("unsupported comparison")
+                return set().union(*map(self.__collect_names, [left, *comparators]))
+            case ast.List(elts=elements) | ast.Tuple(elts=elements):
+                return set().union(*map(self.__collect_names, elements))
+
+        raise ValueError(f"unsupported syntax '{ast.unparse(node)}'")
+
+    def __evaluate(self, node: ast.AST, values: dict[str, Any]) -> Any:
+        match node:
+            case ast.Name(id=name):
+                if name in NAMED_CONSTANTS:
+                    return NAMED_CONSTANTS[name]
+                return _comparable(values.get(name))
+            case ast.Constant(value=value):
+                return _comparable(value)
+            case ast.BoolOp(op=ast.And(), values=operands):
+                return all(self.__evaluate(operand, values) for operand in operands)
+            case ast.BoolOp(op=ast.Or(), values=operands):
+                return any(self.__evaluate(operand, values) for operand in operands)
+            case ast.UnaryOp(op=ast.Not(), operand=operand):
+                return not self.__evaluate(operand, values)
+            case ast.UnaryOp(op=ast.USub(), operand=operand):
+                return -self.__evaluate(operand, values)
+            case ast.Compare(left=left, ops=ops, comparators=comparators):
+                lhs = self.__evaluate(left, values)
+                for op, comparator in zip(ops, comparators):
+                    rhs = self.__evaluate(comparator, values)
+                    # Unset parameters never satisfy an ordering comparison
+                    try:
+                        if not COMPARISON_OPERATORS[type(op)](lhs, rhs):
+                            return False
+                    except TypeError:
+                        return False
+                    lhs = rhs
+                return True
+            case ast.List(elts=elements) | ast.Tuple(elts=elements):
+                return [self.__evaluate(element, values) for element in elements]
+
+        raise ValueError(f"unsupported syntax '{ast.unparse(node)}'")
+
+    def evaluate(self, values: dict[str, Any]) -> bool:
+        return bool(self.__evaluate(self.__tree, values))
+
+    def is_decidable(self, values: dict[str, Any]) -> bool:
+        return self.names <= values.keys()
+
+
+class CombinationRules:
+    def __init__(
+        self, exclude: list[str] | None = None, require: list[str] | None = None
+    ):
+        self.exclude = [Rule(expression) for expression in exclude or []]
+        self.require = [Rule(expression) for expression in require or []]
+
+    def allows(self, values: dict[str, Any], complete: bool = True) -> bool:
+        """
+        Checks values against every rule, when `complete` is False rules that
+        reference parameters not yet present in values are skipped so partially
+        expanded combinations can be pruned early.
+        """
+        for rule in self.exclude:
+            if (complete or rule.is_decidable(values)) and rule.evaluate(values):
+                return False
+
+        for rule in self.require:
+            if (complete or rule.is_decidable(values)) and not rule.evaluate(values):
+                return False
+
+        return True
+
+    def combined_with(self, other: "CombinationRules") -> "CombinationRules":
+        combined = CombinationRules()
+        combined.exclude = self.exclude + other.exclude
+        combined.require = self.require + other.require
+        return combined
+
+    def __bool__(self):
+        return len(self.exclude) > 0 or len(self.require) > 0
+
+
+def split_combination_rules(
+    combination_set: dict[str, Any],
+) -> tuple[dict[str, list], CombinationRules]:
+    values = {
+        key: value for key, value in combination_set.items() if key not in RULE_KEYS
+    }
+    rules = CombinationRules(
+        exclude=combination_set.get("exclude"),
+        require=combination_set.get("require"),
+    )
+    return values, rules
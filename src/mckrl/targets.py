@@ -0,0 +1,277 @@
+# SPDX-License-Identifier: Apache-2.0
+
+import html
+import json
+import re
+from abc import ABCMeta, abstractmethod
+from dataclasses import asdict
+from pathlib import Path
+from typing import Final
+
+from loguru import logger
+
+from mckrl.generators.footprints.keyswitch.plate import PLATE_LAYER
+from mckrl.kicad_mod import FootprintGeometry, LineGeometry, parse_footprint
+from mckrl.mirror import (
+    ReversibleOverlapError,
+    mirror_kicad_mod,
+    rename_kicad_mod,
+    reversible_kicad_mod,
+)
+
+DEFAULT_TARGETS: Final[list[str]] = ["kicad"]
+# Targets written into the footprint library itself rather than the emit directory
+LIBRARY_TARGETS: Final[set[str]] = {"kicad", "back", "reversible"}
+
+PLATE_DXF_LAYER: Final[str] = "Plate"
+PLATE_STROKE_WIDTH_MM: Final[float] = 0.01
+
+# Older KiCad releases reject tokens introduced after them, pinned targets strip
+# those nodes & stamp the older format version
+KICAD_FORMAT_VERSIONS: Final[dict[str, tuple[int, list[str]]]] = {
+    "kicad9": (20241229, ["duplicate_pad_numbers_are_jumpers"]),
+    "kicad8": (
+        20240108,
+        ["duplicate_pad_numbers_are_jumpers", "embedded_fonts", "tenting"],
+    ),
+}
+
+_NODE_TOKEN_PATTERN = re.compile(r'\(|\)|"(?:[^"\\]|\\.)*"')
+_NODE_HEAD_PATTERN = re.compile(r'\(\s*([^\s()"]+)')
+_VERSION_PATTERN = re.compile(r"\(version\s+\d+\)")
+
+
+class OutputTarget(metaclass=ABCMeta):
+    name: str
+    suffix: str
+    needs_geometry: bool = True
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+
+    def __str__(self):
+        return self.name
+
+    def path_for(self, footprint_name: str) -> Path:
+        return self.directory / f"{footprint_name}{self.suffix}"
+
+    @abstractmethod
+    def render(self, kicad_mod: str, geometry: FootprintGeometry | None) -> str:
+        pass
+
+
+class KicadTarget(OutputTarget):
+    name = "kicad"
+    suffix = ".kicad_mod"
+    needs_geometry = False
+
+    def render(self, kicad_mod: str, geometry: FootprintGeometry | None) -> str:
+        return kicad_mod
+
+
+class PinnedKicadTarget(KicadTarget):
+    def __init__(self, directory: Path, name: str):
+        super().__init__(directory)
+        self.name = name
+        self.version, self.unsupported_nodes = KICAD_FORMAT_VERSIONS[name]
+
+    def render(self, kicad_mod: str, geometry: FootprintGeometry | None) -> str:
+        kicad_mod = remove_sexpr_nodes(kicad_mod, self.unsupported_nodes)
+        return _VERSION_PATTERN.sub(f"(version {self.version})", kicad_mod, count=1)
+
+
+class BackTarget(KicadTarget):
+    """
+    The front footprint mirrored onto the back of the board, named with a
+    `_back` suffix.
+    """
+
+    name = "back"
+
+    def path_for(self, footprint_name: str) -> Path:
+        return super().path_for(f"{footprint_name}_{self.name}")
+
+    def render(self, kicad_mod: str, geometry: FootprintGeometry | None) -> str:
+        return rename_kicad_mod(mirror_kicad_mod(kicad_mod), f"_{self.name}")
+
+
+class ReversibleTarget(BackTarget):
+    """
+    The front footprint merged with its mirrored back, for switches that can be
+    soldered from either side. Named with a `_reversible` suffix.
+    """
+
+    name = "reversible"
+
+    def render(self, kicad_mod: str, geometry: FootprintGeometry | None) -> str:
+        return rename_kicad_mod(reversible_kicad_mod(kicad_mod), f"_{self.name}")
+
+
+class JsonTarget(OutputTarget):
+    name = "json"
+    suffix = ".json"
+
+    def render(self, kicad_mod: str, geometry: FootprintGeometry | None) -> str:
+        assert geometry is not None
+        geometry_dict = asdict(geometry)
+        del geometry_dict["path"]
+        return json.dumps(geometry_dict, indent=2) + "\n"
+
+
+def _plate_lines(geometry: FootprintGeometry) -> list[LineGeometry]:
+    lines = geometry.lines_on_layer(PLATE_LAYER)
+    if len(lines) == 0:
+        raise ValueError(
+            f"{geometry.name} has no plate cutouts on {PLATE_LAYER} to export"
+        )
+    return lines
+
+
+class SvgTarget(OutputTarget):
+    """
+    Switch & stabiliser plate cutouts as hairline paths sized in millimetres,
+    ready for laser cutting.
+    """
+
+    name = "svg"
+    suffix = ".svg"
+
+    def render(self, kicad_mod: str, geometry: FootprintGeometry | None) -> str:
+        assert geometry is not None
+        lines = _plate_lines(geometry)
+        xs = [x for line in lines for x in (line.start[0], line.end[0])]
+        ys = [y for line in lines for y in (line.start[1], line.end[1])]
+        width, height = max(xs) - min(xs), max(ys) - min(ys)
+
+        return "\n".join(
+            [
+                '<svg xmlns="http://www.w3.org/2000/svg" '
+                f'viewBox="{min(xs):g} {min(ys):g} {width:g} {height:g}" '
+                f'width="{width:g}mm" height="{height:g}mm" fill="none" '
+                f'stroke="black" stroke-width="{PLATE_STROKE_WIDTH_MM:g}">',
+                f"<title>{html.escape(geometry.name)}</title>",
+                *(
+                    f'<line x1="{line.start[0]:g}" y1="{line.start[1]:g}" '
+                    f'x2="{line.end[0]:g}" y2="{line.end[1]:g}"/>'
+                    for line in lines
+                ),
+                "</svg>",
+                "",
+            ]
+        )
+
+
+class DxfTarget(OutputTarget):
+    """
+    Switch & stabiliser plate cutouts as lines on a single DXF layer for laser
+    cutting. DXF is Y-up so coordinates are mirrored from KiCad's Y-down.
+    """
+
+    name = "dxf"
+    suffix = ".dxf"
+
+    def render(self, kicad_mod: str, geometry: FootprintGeometry | None) -> str:
+        assert geometry is not None
+        entities = []
+
+        for line in _plate_lines(geometry):
+            entities += [
+                *("0", "LINE", "8", PLATE_DXF_LAYER),
+                *("10", f"{line.start[0]:g}", "20", f"{-line.start[1]:g}", "30", "0"),
+                *("11", f"{line.end[0]:g}", "21", f"{-line.end[1]:g}", "31", "0"),
+            ]
+
+        return "\n".join(
+            ["0", "SECTION", "2", "ENTITIES", *entities, "0", "ENDSEC", "0", "EOF", ""]
+        )
+
+
+TARGETS: Final[dict[str, type[OutputTarget]]] = {
+    "kicad": KicadTarget,
+    "back": BackTarget,
+    "reversible": ReversibleTarget,
+    "json": JsonTarget,
+    "svg": SvgTarget,
+    "dxf": DxfTarget,
+}
+
+
+def parse_target_names(emit: str) -> list[str]:
+    names = [name.strip() for name in emit.split(",") if name.strip() != ""]
+    unknown = [
+        name
+        for name in names
+        if name not in TARGETS and name not in KICAD_FORMAT_VERSIONS
+    ]
+    if len(unknown) > 0:
+        supported = sorted([*TARGETS, *KICAD_FORMAT_VERSIONS])
+        raise ValueError(
+            f"Unsupported output targets: {', '.join(unknown)} "
+            f"(supported: {', '.join(supported)})"
+        )
+    return names
+
+
+def create_target(name: str, directory: Path) -> OutputTarget:
+    if name in KICAD_FORMAT_VERSIONS:
+        return PinnedKicadTarget(directory, name)
+    return TARGETS[name](directory)
+
+
+def remove_sexpr_nodes(text: str, node_names: list[str]) -> str:
+    """
+    Removes every node whose head is one of node_names, along with the
+    whitespace leading up to it, leaving the rest of the text untouched.
+    """
+    spans = []
+    stack: list[tuple[int, bool]] = []
+    for match in _NODE_TOKEN_PATTERN.finditer(text):
+        token = match.group()
+        if token == "(":
+            head = _NODE_HEAD_PATTERN.match(text, match.start())
+            removed = head is not None and head.group(1) in node_names
+            stack.append((match.start(), removed))
+        elif token == ")":
+            start, removed = stack.pop()
+            if removed and not any(is_removed for _, is_removed in stack):
+                spans.append((start, match.end()))
+
+    result = []
+    position = 0
+    for start, end in spans:
+        result.append(text[position:start].rstrip(" \t\n"))
+        position = end
+    result.append(text[position:])
+
+    return "".join(result)
+
+
+def write_targets(
+    footprint_name: str, kicad_mod: str, targets: list[OutputTarget]
+) -> list[Path]:
+    """
+    Writes one footprint to every target, the serialised footprint is parsed at
+    most once & the resulting geometry shared by all targets that need it.
+
+    Footprints that can't be made reversible only skip the reversible target,
+    every other target is still written & returned.
+    """
+    geometry = None
+    if any(target.needs_geometry for target in targets):
+        geometry = parse_footprint(kicad_mod)
+
+    paths = []
+    for target in targets:
+        path = target.path_for(footprint_name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Never write through a hard link restored from the artifact cache
+        path.unlink(missing_ok=True)
+        try:
+            rendered = target.render(kicad_mod, geometry)
+        except ReversibleOverlapError as e:
+            logger.warning(f"Skipped the {target} target for {footprint_name}: {e}")
+            continue
+        path.write_text(rendered)
+        paths.append(path)
+
+    return paths
@@ -0,0 +1,45 @@
+import textwrap
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+GENERATOR_TEMPLATE = """
+from pathlib import Path
+
+
+def generate(output_dir: str, {parameters}):
+{body}
+"""
+
+FakeLibraryWriter = Callable[..., Path]
+
+
+@pytest.fixture
+def fake_library(tmp_path: Path) -> FakeLibraryWriter:
+    # Writes generators/fake.py with the given generate() parameters & body along
+    # with a definitions/lib.pretty/fake.yaml generating one footprint per name
+    def write(
+        parameters: str,
+        body: str,
+        names: tuple[str, ...] = ("a", "b"),
+        combinations: str = "[]",
+    ) -> Path:
+        (tmp_path / "generators").mkdir(exist_ok=True)
+        (tmp_path / "generators/fake.py").write_text(
+            GENERATOR_TEMPLATE.format(
+                parameters=parameters,
+                body=textwrap.indent(textwrap.dedent(body).strip("\n"), "    "),
+            )
+        )
+        (tmp_path / "definitions/lib.pretty").mkdir(parents=True, exist_ok=True)
+        (tmp_path / "definitions/lib.pretty/fake.yaml").write_text(
+            "generator: fake.py\n"
+            "defaults: {}\n"
+            f"combinations: {combinations}\n"
+            "inputs:\n" + "".join(f"  - name: {name}\n" for name in names)
+        )
+        (tmp_path / "constant").mkdir(exist_ok=True)
+        return tmp_path
+
+    return write
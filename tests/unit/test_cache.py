@@ -0,0 +1,73 @@
+import os
+import shutil
+from pathlib import Path
+from mckrl.cache import ArtifactCache
+from mckrl.checkpoint import CheckpointJournal
+from mckrl.cli import generate_kicad_objects
+from mckrl.events import EventStream
+
+
+def generate(tmp_path: Path, output: str, cache: ArtifactCache):
+    with CheckpointJournal(tmp_path / f"{output}.jsonl") as journal:
+        return generate_kicad_objects(
+            tmp_path / "definitions",
+            tmp_path / "generators",
+            tmp_path / output,
+            journal,
+            EventStream(),
+            cache=cache,
+        )
+
+
+def test_cached_footprints_are_restored_without_generating(
+    tmp_path: Path, fake_library
+):
+    fake_library(
+        "name: str",
+        """
+        path = Path(output_dir) / f"{name}.kicad_mod"
+        path.write_text(name * 100)
+        with open(Path(__file__).parent / "calls", "a") as calls:
+            calls.write(name + "\\n")
+        return path
+        """,
+    )
+    cache = ArtifactCache(tmp_path / "cache", max_bytes=1024 * 1024)
+
+    generate(tmp_path, "first", cache)
+    generate(tmp_path, "second", cache)
+
+    assert (tmp_path / "generators/calls").read_text().split() == ["a", "b"]
+    assert (tmp_path / "second/lib.pretty/b.kicad_mod").read_text() == "b" * 100
+
+    # Only the most recently used entry fits in 150 bytes
+    entries = sorted(cache.entries_directory.glob("*/*/entry.json"))
+    os.utime(entries[0], (0, 0))
+    cache.max_bytes = 150
+    assert cache.collect_garbage() == 1
+    assert len(list(cache.entries_directory.glob("*/*/entry.json"))) == 1
+
+
+def test_cache_problems_fall_back_to_generating(tmp_path: Path, fake_library):
+    fake_library(
+        "name: str",
+        """
+        path = Path(output_dir) / f"{name}.kicad_mod"
+        path.write_text(name)
+        with open(Path(__file__).parent / "calls", "a") as calls:
+            calls.write(name + "\\n")
+        return path
+        """,
+    )
+    cache = ArtifactCache(tmp_path / "cache", max_bytes=1024 * 1024)
+
+    assert generate(tmp_path, "first", cache) == []
+    for metadata_path in cache.entries_directory.glob("*/*/entry.json"):
+        metadata_path.write_text('{"version": 1}')
+    # Staging directories can no longer be created, so publishing fails
+    shutil.rmtree(cache.temporary_directory)
+    cache.temporary_directory.write_text("")
+
+    assert generate(tmp_path, "second", cache) == []
+    assert (tmp_path / "generators/calls").read_text().split() == ["a", "b"] * 2
+    assert (tmp_path / "second/lib.pretty/b.kicad_mod").read_text() == "b"
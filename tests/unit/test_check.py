@@ -0,0 +1,64 @@
+from pathlib import Path
+from mckrl.check import check_footprints
+from mckrl.kicad_mod import parse_footprint, read_footprint
+
+
+def footprint_with_pads(*pads: str) -> str:
+    return f"""
+    (footprint "Test"
+        (fp_line (start -9.5 -9.5) (end 9.5 -9.5) (layer "Dwgs.User"))
+        (fp_line (start 9.5 9.5) (end -9.5 9.5) (layer "Dwgs.User"))
+        {" ".join(pads)}
+    )
+    """
+
+
+def test_constant_footprints_pass_checks():
+    constants = Path(__file__).parent.parent.parent / "constant"
+    footprints = [read_footprint(path) for path in constants.rglob("*.kicad_mod")]
+
+    assert check_footprints(footprints) == []
+
+
+def test_reporting_each_rule():
+    footprint = parse_footprint(
+        footprint_with_pads(
+            '(pad "1" thru_hole circle (at 0 0) (size 1.7 1.7) (drill 1.55))',
+            '(pad "" np_thru_hole circle (at -1.5 0) (size 1.5 1.5) (drill 1.5))',
+            '(pad "2" thru_hole circle (at 9 0) (size 2.54 2.54) (drill 1.5))',
+        )
+    )
+
+    rules = [violation.rule for violation in check_footprints([footprint])]
+
+    assert sorted(rules) == [
+        "annular-ring",
+        "copper-to-hole",
+        "hole-to-hole",
+        "spacing-box",
+    ]
+
+
+def test_stabiliser_holes_may_leave_the_spacing_box():
+    # Pads of a generated 2u Cherry switch with a Cherry stabiliser, the 4mm
+    # housing holes reach 10.24mm below the centre of a 19.05mm spacing box
+    footprint = parse_footprint(
+        f"""
+        (footprint "Test"
+            (fp_line (start -19.05 -9.525) (end 19.05 -9.525) (layer "Dwgs.User"))
+            (fp_line (start 19.05 9.525) (end -19.05 9.525) (layer "Dwgs.User"))
+            (pad "1" thru_hole circle (at -3.81 -2.54) (size 2.54 2.54) (drill 1.55))
+            (pad "2" thru_hole circle (at 2.54 -5.08) (size 2.54 2.54) (drill 1.55))
+            (pad "" np_thru_hole circle (at 0 0) (size 4.1 4.1) (drill 4.1))
+            {
+            " ".join(
+                f'(pad "" np_thru_hole circle (at {x} {y}) (size {d} {d}) (drill {d}))'
+                for x in (-11.938, 11.938)
+                for y, d in ((-7, 3.05), (8.24, 4))
+            )
+        }
+        )
+        """
+    )
+
+    assert check_footprints([footprint]) == []
@@ -0,0 +1,74 @@
+from pathlib import Path
+from mckrl.checkpoint import CheckpointJournal
+from mckrl.cli import generate_kicad_objects
+from mckrl.events import EventStream
+
+
+def test_failures_are_isolated_and_completed_definitions_resumed(
+    tmp_path: Path, fake_library
+):
+    fake_library(
+        "name: str, broken: bool = False",
+        """
+        if broken:
+            raise ValueError(f"{name} is broken")
+        (Path(output_dir) / name).write_text(name)
+        """,
+        combinations="[{broken: [true, false]}]",
+    )
+    (tmp_path / "definitions/lib.pretty/invalid.yaml").write_text("generator: x.py")
+    journal_path = tmp_path / "journal.jsonl"
+
+    def run(resume: bool):
+        with CheckpointJournal(journal_path, resume=resume) as journal:
+            return generate_kicad_objects(
+                tmp_path / "definitions",
+                tmp_path / "generators",
+                tmp_path / "generated",
+                journal,
+                EventStream(),
+            )
+
+    failures = run(resume=False)
+
+    assert sorted((str(f.yaml_path), f.error_type) for f in failures) == [
+        ("lib.pretty/fake.yaml", "ValueError"),
+        ("lib.pretty/fake.yaml", "ValueError"),
+        ("lib.pretty/invalid.yaml", "FileNotFoundError"),
+    ]
+    assert (tmp_path / "generated/lib.pretty/a").exists()
+    assert len(journal_path.read_text().splitlines()) == 2
+
+    (tmp_path / "generated/lib.pretty/a").unlink()
+    run(resume=True)
+
+    assert not (tmp_path / "generated/lib.pretty/a").exists()
+    assert len(journal_path.read_text().splitlines()) == 2
+
+
+def test_serial_runs_record_each_definition_before_the_next(
+    tmp_path: Path, fake_library
+):
+    # Each call notes how many definitions the journal already holds
+    fake_library(
+        "name: str",
+        """
+        journal = Path(output_dir).parent.parent / "journal.jsonl"
+        recorded = len(journal.read_text().splitlines())
+        (Path(output_dir) / name).write_text(str(recorded))
+        """,
+        names=("a", "b", "c"),
+    )
+
+    with CheckpointJournal(tmp_path / "journal.jsonl") as journal:
+        generate_kicad_objects(
+            tmp_path / "definitions",
+            tmp_path / "generators",
+            tmp_path / "generated",
+            journal,
+            EventStream(),
+        )
+
+    assert [
+        (tmp_path / "generated/lib.pretty" / name).read_text() for name in "abc"
+    ] == ["0", "1", "2"]
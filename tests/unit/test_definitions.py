@@ -0,0 +1,60 @@
+from pathlib import Path
+import pytest
+from mckrl.cli import compute_all_definitions
+from mckrl.definitions import DefinitionCycleError, DefinitionLoader
+
+
+def test_extends_and_include_share_defaults_and_combinations(tmp_path: Path):
+    (tmp_path / "_shared.yaml").write_text(
+        "generator: generate.py\n"
+        "defaults: {prefix: Shared, switch_type: cherry}\n"
+        "combinations:\n"
+        "  - include: _led-diode.yaml\n"
+    )
+    (tmp_path / "_led-diode.yaml").write_text(
+        "combinations:\n"
+        "  - led: [true, false]\n"
+        "    diode: [true, false]\n"
+        "    exclude: [led and diode]\n"
+    )
+    (tmp_path / "stabilised.yaml").write_text(
+        "extends: _shared.yaml\n"
+        "defaults: {stabiliser_type: cherry}\n"
+        "combinations:\n"
+        "  - rotation: [0, 180]\n"
+        "    include: _led-diode.yaml\n"
+        "inputs: [{width: 2u}]\n"
+    )
+    loader = DefinitionLoader()
+
+    document = loader.load(tmp_path / "stabilised.yaml")
+
+    assert document["generator"] == "generate.py"
+    assert document["defaults"] == {
+        "prefix": "Shared",
+        "switch_type": "cherry",
+        "stabiliser_type": "cherry",
+    }
+    assert document["combinations"] == [
+        {
+            "rotation": [0, 180],
+            "led": [True, False],
+            "diode": [True, False],
+            "exclude": ["led and diode"],
+        }
+    ]
+    # The memoised expansion matches expanding the spliced document
+    assert compute_all_definitions(
+        document, {}, loader.combinations(tmp_path / "stabilised.yaml")
+    ) == compute_all_definitions(document)
+    assert loader.combinations(tmp_path / "_led-diode.yaml") is loader.combinations(
+        tmp_path / "_led-diode.yaml"
+    )
+
+
+def test_cycles_are_detected(tmp_path: Path):
+    (tmp_path / "_a.yaml").write_text("extends: _b.yaml\n")
+    (tmp_path / "_b.yaml").write_text("combinations:\n  - include: _a.yaml\n")
+
+    with pytest.raises(DefinitionCycleError, match="_a.yaml -> _b.yaml -> _a.yaml"):
+        DefinitionLoader().load(tmp_path / "_a.yaml")
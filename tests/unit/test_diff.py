@@ -0,0 +1,51 @@
+import shutil
+from pathlib import Path
+from mckrl.diff import diff_libraries
+from mckrl.manifest import write_manifest
+
+CONSTANTS = Path(__file__).parent.parent.parent / "constant"
+LIBRARY = "footprints/cherry_mx.pretty"
+ISO = f"{LIBRARY}/Cherry_MX1A_19.05mm_ISO.kicad_mod"
+FLIPPED = f"{LIBRARY}/Cherry_MX1A_19.05mm_ISO_flipped-stab.kicad_mod"
+
+
+def create_libraries(tmp_path: Path) -> tuple[Path, Path]:
+    old, new = tmp_path / "old", tmp_path / "new"
+    shutil.copytree(CONSTANTS, old)
+    shutil.copytree(CONSTANTS, new)
+
+    iso = new / ISO
+    iso.write_text(
+        iso.read_text()
+        .replace("(at -3.81 -2.54)", "(at -3.81 -2.6)")
+        .replace("(drill 1.55)", "(drill 1.5)", 1)
+    )
+    (new / FLIPPED).rename(new / f"{LIBRARY}/Added.kicad_mod")
+    return old, new
+
+
+def test_semantic_diff_between_libraries(tmp_path: Path):
+    old, new = create_libraries(tmp_path)
+
+    library_diff = diff_libraries(old, new)
+
+    assert library_diff.added == [f"{LIBRARY}/Added.kicad_mod"]
+    assert library_diff.removed == [FLIPPED]
+    assert library_diff.changed == {
+        ISO: [
+            "pad 1 moved (-3.81, -2.54) -> (-3.81, -2.6)",
+            "pad 1 drill resized 1.55mm -> 1.5mm",
+        ]
+    }
+
+
+def test_manifests_are_used_when_present(tmp_path: Path):
+    old, new = create_libraries(tmp_path)
+    write_manifest(old)
+    write_manifest(new)
+    (old / FLIPPED).unlink()
+
+    library_diff = diff_libraries(old, new)
+
+    assert library_diff.removed == [FLIPPED]
+    assert list(library_diff.changed) == [ISO]
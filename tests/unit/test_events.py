@@ -0,0 +1,67 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typer.testing import CliRunner
+from mckrl.cli import cli
+
+GENERATE_BODY = """
+path = Path(output_dir) / f"{name}.kicad_mod"
+path.write_text(name)
+return path
+"""
+
+
+def test_events_are_written_as_jsonl(tmp_path: Path, fake_library):
+    fake_library("name: str", GENERATE_BODY, names=("a", "bb"))
+
+    result = CliRunner().invoke(
+        cli,
+        [
+            *("--definitions", str(tmp_path / "definitions")),
+            *("--generators", str(tmp_path / "generators")),
+            *("--output", str(tmp_path / "generated")),
+            *("--constants", str(tmp_path / "constant")),
+            *("--events", str(tmp_path / "events.jsonl")),
+        ],
+    )
+    assert result.exit_code == 0
+
+    events = [
+        json.loads(line)
+        for line in (tmp_path / "events.jsonl").read_text().splitlines()
+    ]
+
+    assert [event["event"] for event in events] == [
+        "run_started",
+        "file_started",
+        "definitions_expanded",
+        "footprint_generated",
+        "footprint_generated",
+        "file_finished",
+        "run_finished",
+    ]
+    assert [event["bytes"] for event in events[3:5]] == [1, 2]
+
+
+def test_stdout_events_are_not_mixed_with_console_output(tmp_path: Path, fake_library):
+    fake_library("name: str", GENERATE_BODY, names=("a", "bb"))
+
+    # Run in a real process so the events go to the actual stdout descriptor
+    result = subprocess.run(
+        [
+            *(sys.executable, "-c", "from mckrl.cli import cli; cli()"),
+            *("--definitions", str(tmp_path / "definitions")),
+            *("--generators", str(tmp_path / "generators")),
+            *("--output", str(tmp_path / "generated")),
+            *("--constants", str(tmp_path / "constant")),
+            *("--events", "-"),
+        ],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0
+
+    events = [json.loads(line) for line in result.stdout.splitlines()]
+    assert events[-1]["event"] == "run_finished"
+    assert "Found 2 definitions" in result.stderr
@@ -0,0 +1,49 @@
+from pathlib import Path
+import pytest
+from mckrl.checkpoint import CheckpointJournal
+from mckrl.cli import generate_kicad_objects
+from mckrl.events import EventStream
+from mckrl.executors import ExecutorKind, create_executor
+
+
+@pytest.mark.parametrize("executor_kind", list(ExecutorKind))
+def test_every_executor_generates_the_same_library(
+    tmp_path: Path, fake_library, executor_kind: ExecutorKind
+):
+    fake_library(
+        "name: str, size: int",
+        """
+        if size > 2:
+            raise ValueError(f"{name} is too big")
+        path = Path(output_dir) / f"{name}_{size}.kicad_mod"
+        path.write_text(name * size)
+        return path
+        """,
+        combinations="[{size: [1, 2, 3]}]",
+    )
+    events = []
+    event_stream = EventStream()
+    event_stream.subscribe(events.append)
+
+    with (
+        CheckpointJournal(tmp_path / "journal.jsonl", resume=False) as journal,
+        create_executor(executor_kind, jobs=2) as executor,
+    ):
+        failures = generate_kicad_objects(
+            tmp_path / "definitions",
+            tmp_path / "generators",
+            tmp_path / "generated",
+            journal,
+            event_stream,
+            executor=executor,
+        )
+
+    assert sorted(failure.message for failure in failures) == [
+        "a is too big",
+        "b is too big",
+    ]
+    assert sorted(
+        path.name for path in (tmp_path / "generated/lib.pretty").iterdir()
+    ) == ["a_1.kicad_mod", "a_2.kicad_mod", "b_1.kicad_mod", "b_2.kicad_mod"]
+    generated = [event for event in events if event["event"] == "footprint_generated"]
+    assert [event["bytes"] for event in generated] == [1, 2, 1, 2]
@@ -0,0 +1,110 @@
+from pathlib import Path
+
+import pytest
+
+from mckrl.kicad_mod import parse_footprint
+from mckrl.mirror import (
+    ReversibleOverlapError,
+    mirror_kicad_mod,
+    reversible_kicad_mod,
+)
+from mckrl.targets import create_target, write_targets
+
+ISO = (
+    Path(__file__).parent.parent.parent
+    / "constant/footprints/cherry_mx.pretty/Cherry_MX1A_19.05mm_ISO.kicad_mod"
+)
+
+
+def test_back_variant_is_mirrored_onto_the_back_layers():
+    front = parse_footprint(ISO.read_text())
+    back = parse_footprint(mirror_kicad_mod(ISO.read_text()))
+
+    assert [(pad.number, -pad.x, pad.y) for pad in back.pads] == [
+        (pad.number, pad.x, pad.y) for pad in front.pads
+    ]
+    assert len(back.lines_on_layer("B.CrtYd")) == len(front.lines_on_layer("F.CrtYd"))
+    assert back.lines_on_layer("F.CrtYd") == []
+    assert mirror_kicad_mod(mirror_kicad_mod(ISO.read_text())) == ISO.read_text()
+
+
+def test_reversible_variant_does_not_repeat_symmetric_holes(tmp_path: Path):
+    targets = [create_target(name, tmp_path) for name in ["back", "reversible"]]
+
+    paths = write_targets("ISO", ISO.read_text(), targets)
+
+    assert [path.name for path in paths] == [
+        "ISO_back.kicad_mod",
+        "ISO_reversible.kicad_mod",
+    ]
+    back, reversible = [parse_footprint(path.read_text()) for path in paths]
+    assert back.name == "Cherry_MX1A_19.05mm_ISO_back"
+    assert reversible.name == "Cherry_MX1A_19.05mm_ISO_reversible"
+
+    positions = [(pad.x, pad.y) for pad in reversible.pads]
+    assert len(positions) == len(set(positions))
+    assert (0, 0) in positions
+    assert len(reversible.lines_on_layer("F.CrtYd")) > 0
+    assert len(reversible.lines_on_layer("B.CrtYd")) > 0
+
+
+def keyswitch(*pads: tuple[str, float, float, float, float]) -> str:
+    return (
+        '(footprint "Switch"\n'
+        + "".join(
+            f'\t(pad "{number}" thru_hole circle (at {x} {y}) (size {size} {size}) '
+            f'(drill {drill}) (layers "*.Cu" "*.Mask"))\n'
+            for number, x, y, size, drill in pads
+        )
+        + '\t(pad "" np_thru_hole circle (at 0 0) (size 4.1 4.1) (drill 4.1) '
+        '(layers "*.Cu" "*.Mask"))\n'
+        ")\n"
+    )
+
+
+CHERRY = (("1", -3.81, -2.54, 2.54, 1.55), ("2", 2.54, -5.08, 2.54, 1.55))
+
+
+def test_reversible_cherry_adds_mirrored_pins():
+    reversible = parse_footprint(reversible_kicad_mod(keyswitch(*CHERRY)))
+
+    assert [(pad.number, pad.x, pad.y) for pad in reversible.pads] == [
+        ("1", -3.81, -2.54),
+        ("2", 2.54, -5.08),
+        ("", 0, 0),
+        ("1", 3.81, -2.54),
+        ("2", -2.54, -5.08),
+    ]
+
+
+@pytest.mark.parametrize(
+    "pads",
+    [
+        # Cherry LED, mirrored pad 3 lands on pad 4 & vice versa
+        CHERRY + (("3", -1.27, 5.08, 1.905, 1), ("4", 1.27, 5.08, 1.905, 1)),
+        # Cherry diode
+        CHERRY + (("3", -3.81, 5.08, 1.905, 1), ("4", 3.81, 5.08, 1.905, 1)),
+        # Alps, mirrored pad 1 is 0.5mm away from pad 2
+        (("1", 2.5, -4.5, 2.54, 1.5), ("2", -2.5, -4, 2.54, 1.5)),
+    ],
+    ids=["cherry-led", "cherry-diode", "alps"],
+)
+def test_reversible_rejects_pads_shorted_by_mirroring(pads):
+    with pytest.raises(ReversibleOverlapError):
+        reversible_kicad_mod(keyswitch(*pads))
+
+
+def test_only_the_reversible_target_is_skipped_when_pads_would_short(tmp_path: Path):
+    led = keyswitch(*CHERRY, ("3", -1.27, 5.08, 1.905, 1), ("4", 1.27, 5.08, 1.905, 1))
+    targets = [
+        create_target(name, tmp_path) for name in ["kicad", "back", "reversible"]
+    ]
+    (tmp_path / "LED_reversible.kicad_mod").write_text("stale")
+
+    paths = write_targets("LED", led, targets)
+
+    assert [path.name for path in paths] == [
+        "LED.kicad_mod",
+        "LED_back.kicad_mod",
+    ]
+    assert not (tmp_path / "LED_reversible.kicad_mod").exists()
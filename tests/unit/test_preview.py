@@ -0,0 +1,13 @@
+from pathlib import Path
+from mckrl.preview import render_library_previews
+
+CONSTANTS = Path(__file__).parent.parent.parent / "constant"
+
+
+def test_unchanged_footprints_are_served_from_cache(tmp_path: Path):
+    first = render_library_previews(CONSTANTS, tmp_path / "out", tmp_path / "cache")
+    second = render_library_previews(CONSTANTS, tmp_path / "out", tmp_path / "cache")
+
+    assert not any(rendered.cache_hit for rendered in first)
+    assert all(rendered.cache_hit for rendered in second)
+    assert (tmp_path / "out/footprints/cherry_mx.pretty/index.html").exists()
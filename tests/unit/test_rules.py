@@ -0,0 +1,51 @@
+import pytest
+from mckrl.cli import compute_all_definitions
+from mckrl.combinations import get_combinations_for_combination_set
+from mckrl.rules import CombinationRules, Rule
+
+
+def test_excluded_branches_are_pruned_during_expansion():
+    rules = CombinationRules(exclude=["led and diode"])
+
+    combinations = get_combinations_for_combination_set(
+        {"led": [True, False], "diode": [True, False]}, rules
+    )
+
+    assert combinations == [
+        {"led": False, "diode": True},
+        {"led": True, "diode": False},
+        {"led": False, "diode": False},
+    ]
+
+
+def test_rules_referencing_inputs_are_applied_to_merged_definitions():
+    definitions = compute_all_definitions(
+        {
+            "combinations": [
+                {
+                    "stabiliser_size": ["2u", "3u"],
+                    "exclude": ["stabiliser_size > width"],
+                }
+            ],
+            "inputs": [{"width": "2.25u"}, {"width": "3u"}],
+        }
+    )
+
+    assert definitions == [
+        {"stabiliser_size": "2u", "width": "2.25u"},
+        {"stabiliser_size": "2u", "width": "3u"},
+        {"stabiliser_size": "3u", "width": "3u"},
+    ]
+
+
+def test_require_rules_and_unset_parameters():
+    rules = CombinationRules(require=["rotation in [0, 180]", "offset < 1"])
+
+    assert rules.allows({"rotation": 180, "offset": "0.5u"})
+    assert not rules.allows({"rotation": 90, "offset": "0.5u"})
+    assert not rules.allows({"rotation": 0})
+
+
+def test_invalid_rules_are_rejected():
+    with pytest.raises(ValueError, match="Invalid rule"):
+        Rule("__import__('os')")
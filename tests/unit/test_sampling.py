@@ -0,0 +1,55 @@
+import itertools
+import pytest
+from mckrl.cli import compute_all_definitions
+from mckrl.combinations import parse_sample, sample_definitions
+
+DEFINITION = {
+    "combinations": [
+        {
+            "stabiliser_rotation": [0, 90, 180, 270],
+            "spacing": ["19.00mm", "19.05mm"],
+            "led": [True, False],
+            "diode": [True, False],
+            "exclude": ["led and diode"],
+        }
+    ],
+    "inputs": [
+        {"width": "2u"},
+        {"width": "6u"},
+        {"width": "6u", "switch_horizontal_offset": "9.525mm"},
+    ],
+}
+
+
+def test_pairwise_sample_covers_every_pair_of_values():
+    definitions = compute_all_definitions(DEFINITION)
+
+    sampled = sample_definitions(definitions, parse_sample("pairwise"))
+
+    def pairs(definition: dict) -> set:
+        values = sorted((key, str(value)) for key, value in definition.items())
+        return set(itertools.combinations(values, 2))
+
+    assert len(sampled) < len(definitions) / 4
+    assert set().union(*map(pairs, sampled)) == set().union(*map(pairs, definitions))
+    assert not any(definition["led"] and definition["diode"] for definition in sampled)
+    assert sampled == [
+        definition for definition in definitions if definition in sampled
+    ]
+
+
+def test_random_sample_is_stable_per_seed():
+    definitions = compute_all_definitions(DEFINITION)
+    sample = parse_sample("random:5")
+
+    sampled = sample_definitions(definitions, sample, seed="standard.yaml")
+
+    assert len(sampled) == 5
+    assert sampled == sample_definitions(definitions, sample, seed="standard.yaml")
+    assert sample_definitions(definitions, parse_sample("full")) == definitions
+
+
+@pytest.mark.parametrize("text", ["random", "random:0", "pairwise:3", "all"])
+def test_invalid_samples_are_rejected(text: str):
+    with pytest.raises(ValueError):
+        parse_sample(text)
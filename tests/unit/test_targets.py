@@ -0,0 +1,55 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from mckrl.kicad_mod import parse_footprint
+from mckrl.targets import create_target, write_targets
+
+ISO = (
+    Path(__file__).parent.parent.parent
+    / "constant/footprints/cherry_mx.pretty/Cherry_MX1A_19.05mm_ISO.kicad_mod"
+)
+
+
+def test_every_target_is_written_from_one_serialised_footprint(tmp_path: Path):
+    targets = [
+        create_target(name, tmp_path / name) for name in ["kicad", "kicad8", "json"]
+    ]
+
+    paths = write_targets("ISO", ISO.read_text(), targets)
+
+    assert [path.relative_to(tmp_path).as_posix() for path in paths] == [
+        "kicad/ISO.kicad_mod",
+        "kicad8/ISO.kicad_mod",
+        "json/ISO.json",
+    ]
+    assert paths[0].read_text() == ISO.read_text()
+
+    pinned = paths[1].read_text()
+    assert "(version 20240108)" in pinned
+    assert "tenting" not in pinned and "embedded_fonts" not in pinned
+    assert parse_footprint(pinned).pads == parse_footprint(ISO.read_text()).pads
+
+    assert len(json.loads(paths[2].read_text())["pads"]) == 9
+
+
+def test_plate_targets_only_export_plate_cutouts(tmp_path: Path):
+    plate = "".join(
+        f'(fp_rect (start {x - 7} -7) (end {x + 7} 7) (layer "User.1"))'
+        for x in (0, 19.05)
+    )
+    kicad_mod = ISO.read_text().rstrip()[:-1] + plate + ")"
+    targets = [create_target(name, tmp_path / name) for name in ["svg", "dxf"]]
+
+    svg, dxf = [path.read_text() for path in write_targets("ISO", kicad_mod, targets)]
+
+    assert 'width="33.05mm" height="14mm"' in svg
+    assert svg.count("<line") == 8
+    assert dxf.count("LINE") == 8 and dxf.count("Plate") == 8
+    assert "CIRCLE" not in dxf
+
+
+def test_plate_targets_reject_footprints_without_a_plate(tmp_path: Path):
+    with pytest.raises(ValueError, match="no plate cutouts"):
+        write_targets("ISO", ISO.read_text(), [create_target("dxf", tmp_path)])
@@ -0,0 +1,69 @@
+import pytest
+from KicadModTree import Footprint, KicadFileHandler, Vector2D
+from mckrl.check import check_footprints
+from mckrl.generators.footprints.keyswitch import models
+from mckrl.generators.footprints.keyswitch.generate import generate
+from mckrl.generators.footprints.keyswitch.plate import PLATE_LAYER
+from mckrl.kicad_mod import parse_footprint, read_footprint
+
+
+def emit_pads(model) -> list[tuple[str, float, float]]:
+    footprint = Footprint(name="test")
+    if isinstance(model, models.Keyswitch):
+        model.add_switch_footprint(footprint)
+    else:
+        model.add_stabiliser_footprint(footprint)
+    geometry = parse_footprint(KicadFileHandler(footprint).serialize())
+    return [(pad.number, pad.x, pad.y) for pad in geometry.pads]
+
+
+def test_accessory_pads_come_from_the_led_or_diode_table():
+    led = emit_pads(models.CherryKeyswitch(0, Vector2D(0, 0), led=True, diode=False))
+    diode = emit_pads(models.CherryKeyswitch(0, Vector2D(0, 0), led=False, diode=True))
+
+    assert led[5:] == [("3", -1.27, 5.08), ("4", 1.27, 5.08)]
+    assert diode[5:] == [
+        ("3", pytest.approx(-3.81), 5.08),
+        ("4", pytest.approx(3.81), 5.08),
+    ]
+
+
+def test_tables_are_offset_and_rotated_around_the_model_centre():
+    pads = emit_pads(models.CherryKeyswitch(180, Vector2D(9.525, 0), False, False))
+
+    assert pads[0] == ("1", pytest.approx(9.525 + 3.81), pytest.approx(2.54))
+    assert pads[2] == ("", pytest.approx(9.525), pytest.approx(0))
+
+    stabiliser = emit_pads(models.CherryStabiliser(2, 0))
+    assert [coordinate for _, x, y in stabiliser for coordinate in (x, y)] == (
+        pytest.approx([-11.938, -7, -11.938, 8.24, 11.938, -7, 11.938, 8.24])
+    )
+
+
+def test_plate_cutouts_follow_the_model_rotation():
+    footprint = Footprint(name="test")
+    models.CherryKeyswitch(45, Vector2D(0, 0), False, False).add_switch_footprint(
+        footprint
+    )
+    models.CherryStabiliser(2, 90).add_stabiliser_footprint(footprint)
+    geometry = parse_footprint(KicadFileHandler(footprint).serialize())
+
+    plate = geometry.lines_on_layer(PLATE_LAYER)
+    assert len(plate) == 12
+    # The switch square is rotated onto its corners, stabilisers sit above & below
+    assert max(line.start[0] for line in plate) == pytest.approx(7 * 2**0.5)
+    assert max(abs(line.start[1]) for line in plate) == pytest.approx(11.938 + 6.65 / 2)
+
+
+def test_generated_stabilised_footprint_passes_checks(tmp_path):
+    [path] = generate(
+        str(tmp_path),
+        "Cherry",
+        "cherry",
+        "2u",
+        "19.05mm",
+        stabiliser_type="cherry",
+        stabiliser_size="2u",
+    )
+
+    assert check_footprints([read_footprint(path)]) == []
@@ -1,5 +1,6 @@
 from pathlib import Path
 import yaml
+from mckrl.definitions import DefinitionLoader
 from mckrl.model import create_validation_model
 from mckrl.generators.footprints.keyswitch import generate as keyswitch
 
@@ -17,10 +18,8 @@ def test_creating_model_for_generator_params():
 def test_validating_keyswitch_generate_yaml():
     model = create_validation_model(keyswitch.generate)
     _validated = model.model_validate(
-        yaml.safe_load(
-            (
-                Path(__file__).parent.parent.parent
-                / "definitions/footprints/cherry_mx.pretty/standard.yaml"
-            ).open()
+        DefinitionLoader().load(
+            Path(__file__).parent.parent.parent
+            / "definitions/footprints/cherry_mx.pretty/standard.yaml"
         )
     )